@@ -7,5 +7,15 @@ class ApiConfig(AppConfig):
     name = "api"
 
     def ready(self):
+        from django.core import checks
+        from django.db.backends.signals import connection_created
+
+        from api.instrumentation import install_query_recorder
+        from api.users.authentication import check_token_cache
+
+        connection_created.connect(install_query_recorder)
+        checks.register(check_token_cache, checks.Tags.caches, deploy=True)
+
         import api.purchase_orders.signals
         import api.users.signals
+        import api.vendors.signals
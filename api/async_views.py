@@ -0,0 +1,92 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from api.middleware import rendering
+from api.renderers import FastJSONRenderer
+from api.users.authentication import CachedTokenAuthentication
+
+
+class AsyncAPIView(View):
+    """
+    Serve JSON requests of the ``async_methods`` natively under ASGI, with
+    the same token authentication as the DRF views (none when
+    ``authentication_class`` is None). Any other request, including browsable
+    API ones, is handed to ``sync_view``, the DRF view the URL maps to under
+    WSGI, in a thread.
+
+    Subclasses implement ``async def <method>(request, *args, **kwargs)``
+    returning a DRF ``Response``, which is always rendered as JSON, or a
+    Django response, which is returned as is.
+    """
+
+    sync_view = None
+    async_methods = ()
+    authentication_class = CachedTokenAuthentication
+    renderer = FastJSONRenderer()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Like DRF views, which authenticate with tokens.
+        view.csrf_exempt = True
+        return view
+
+    def renders_json(self, request):
+        return "format" not in request.GET and "text/html" not in request.headers.get(
+            "Accept", ""
+        )
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method not in self.async_methods or not self.renders_json(request):
+            return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+
+        request = Request(
+            request,
+            parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES],
+        )
+        self.request = request
+        authenticator = None
+        try:
+            if self.authentication_class is not None:
+                authenticator = self.authentication_class()
+                credentials = await authenticator.aauthenticate(request)
+                if credentials is None:
+                    raise exceptions.NotAuthenticated()
+                request.user, request.auth = credentials
+            handler = getattr(self, request.method.lower())
+            response = await handler(request, *args, **kwargs)
+        except (exceptions.APIException, Http404) as exc:
+            if authenticator is not None and isinstance(
+                exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+            ):
+                exc.auth_header = authenticator.authenticate_header(request)
+            response = exception_handler(exc, {"view": self, "request": request})
+        return self.finalize_response(response)
+
+    def finalize_response(self, response):
+        if not isinstance(response, Response):
+            # Responses with their own content, such as streaming ones.
+            return response
+        with rendering(self.request._request):
+            content = self.renderer.render(response.data)
+        finalized = HttpResponse(
+            content, status=response.status_code, content_type="application/json"
+        )
+        for header, value in response.items():
+            if header != "Content-Type":
+                finalized[header] = value
+        if not content:
+            del finalized["Content-Type"]
+        return finalized
+
+
+class AsyncReadView(AsyncAPIView):
+    """``AsyncAPIView`` serving ``GET`` and ``HEAD`` with ``get()``."""
+
+    async_methods = ("GET", "HEAD")
@@ -0,0 +1,49 @@
+import random
+import time
+
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.purchase_orders.serializers import PurchaseOrderSerializer
+from api.renderers import FastJSONRenderer
+from api.vendors.models import Vendor
+
+from .synthetic import synthetic_purchase_order
+
+RENDERERS = {"stdlib": JSONRenderer, "fast": FastJSONRenderer}
+
+
+def purchase_order_page(rows, seed=0):
+    """A ``/api/purchase_orders/`` page of ``rows`` synthetic orders."""
+    rng = random.Random(seed)
+    now = timezone.now()
+    vendor = Vendor(pk=1, vendor_code="BENCH")
+    purchase_orders = []
+    for number in range(rows):
+        purchase_order = synthetic_purchase_order(rng, vendor, f"PO-{number}", now)
+        purchase_order.pk = number + 1
+        purchase_order.issue_date = purchase_order.order_date
+        purchase_orders.append(purchase_order)
+    return {
+        "next": "http://testserver/api/purchase_orders/?cursor=cD0yMDI0",
+        "previous": None,
+        "results": PurchaseOrderSerializer(purchase_orders, many=True).data,
+    }
+
+
+def compare_renderers(data, iterations=20):
+    """Bytes rendered per second by each renderer in ``RENDERERS``."""
+    results = {}
+    for name, renderer_class in RENDERERS.items():
+        renderer = renderer_class()
+        size = len(renderer.render(data))
+        started = time.perf_counter()
+        for _ in range(iterations):
+            renderer.render(data)
+        elapsed = time.perf_counter() - started
+        results[name] = {
+            "bytes": size,
+            "renders_per_sec": round(iterations / elapsed, 1),
+            "bytes_per_sec": round(size * iterations / elapsed),
+        }
+    return results
@@ -0,0 +1,189 @@
+import json
+import math
+import random
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api.purchase_orders.models import PurchaseOrder
+from api.vendors.cache import performance_cache, performance_cache_key
+from api.vendors.models import Vendor
+
+from .synthetic import SKUS, generate_synthetic_data
+
+BUDGETS_FILE = Path(__file__).with_name("budgets.json")
+
+
+def percentile(samples, percent):
+    # Nearest-rank percentile of sorted samples.
+    return samples[max(0, math.ceil(len(samples) * percent / 100) - 1)]
+
+
+def summarize(durations, query_counts):
+    durations = sorted(duration * 1000 for duration in durations)
+    return {
+        "requests": len(durations),
+        "p50_ms": round(percentile(durations, 50), 3),
+        "p95_ms": round(percentile(durations, 95), 3),
+        "p99_ms": round(percentile(durations, 99), 3),
+        "max_ms": round(durations[-1], 3),
+        "queries": max(query_counts),
+    }
+
+
+def create_payload(vendor_id, number):
+    now = timezone.now()
+    return {
+        "po_number": f"BENCH-{vendor_id}-{number}",
+        "vendor": vendor_id,
+        "order_date": now.isoformat(),
+        "expected_delivery_date": (now + timedelta(days=7)).isoformat(),
+        "items": {"SKU-0001": 2, "SKU-0002": 3},
+        "quantity": 5,
+        "status": "pending",
+    }
+
+
+class Benchmark:
+    """
+    Times ``iterations`` requests of every endpoint scenario against the data
+    in the current database, after one warm-up request, and counts the SQL
+    queries each of them runs.
+    """
+
+    def __init__(self, iterations=50, seed=0):
+        self.iterations = iterations
+        self.rng = random.Random(seed)
+        user, _ = User.objects.get_or_create(username="benchmark")
+        token, _ = Token.objects.get_or_create(user=user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+
+    def sample(self, ids):
+        ids = sorted(ids)
+        return self.rng.sample(ids, min(len(ids), self.iterations + 1))
+
+    def measure(self, request):
+        """``request(i)`` makes the i-th request and returns its response."""
+        request(self.iterations)
+        durations = []
+        query_counts = []
+        for i in range(self.iterations):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = request(i)
+                durations.append(time.perf_counter() - started)
+            assert response.status_code < 400, response.content
+            query_counts.append(len(queries))
+        return summarize(durations, query_counts)
+
+    def run(self):
+        client = self.client
+        vendor_ids = self.sample(Vendor.objects.values_list("pk", flat=True))
+        po_ids = self.sample(PurchaseOrder.objects.values_list("pk", flat=True))
+
+        def vendor_id(i):
+            return vendor_ids[i % len(vendor_ids)]
+
+        def po_id(i):
+            return po_ids[i % len(po_ids)]
+
+        created = []
+
+        def create(i):
+            response = client.post(
+                reverse("purchaseorder-list"),
+                create_payload(vendor_id(i), len(created)),
+                format="json",
+            )
+            created.append(response.data["id"])
+            return response
+
+        def uncached_performance(i):
+            cache, _ = performance_cache()
+            cache.delete(performance_cache_key(vendor_id(i)))
+            return client.get(reverse("vendor-performance", args=[vendor_id(i)]))
+
+        # Orders created by the "po_create" scenario are pending and not
+        # acknowledged, so they can be completed and acknowledged once each.
+        scenarios = {
+            "vendor_list": lambda i: client.get(reverse("vendor-list")),
+            "vendor_detail": lambda i: client.get(
+                reverse("vendor-detail", args=[vendor_id(i)])
+            ),
+            "po_list": lambda i: client.get(reverse("purchaseorder-list")),
+            "po_list_filtered": lambda i: client.get(
+                reverse("purchaseorder-list"),
+                {"vendor": vendor_id(i), "status": "completed"},
+            ),
+            "po_detail": lambda i: client.get(
+                reverse("purchaseorder-detail", args=[po_id(i)])
+            ),
+            "po_sku_lookup": lambda i: client.get(
+                reverse("sku_purchase_orders"),
+                {"sku": SKUS[i % len(SKUS)], "status": "pending"},
+            ),
+            "po_sku_summary": lambda i: client.get(
+                reverse("sku_summary"), {"sku": SKUS[i % len(SKUS)]}
+            ),
+            "po_create": create,
+            "po_status_change": lambda i: client.patch(
+                reverse("purchaseorder-detail", args=[created[i]]),
+                {
+                    "status": "completed",
+                    "delivery_date": timezone.now().isoformat(),
+                    "quality_rating": 4.0,
+                },
+                format="json",
+            ),
+            "po_acknowledge": lambda i: client.post(
+                reverse("acknowledge_purchase_order", args=[created[i]])
+            ),
+            "vendor_performance": uncached_performance,
+            "vendor_performance_cached": lambda i: client.get(
+                reverse("vendor-performance", args=[vendor_id(i)])
+            ),
+        }
+        return {name: self.measure(request) for name, request in scenarios.items()}
+
+
+def load_budgets(path=BUDGETS_FILE):
+    with open(path) as budgets:
+        return json.load(budgets)
+
+
+def over_budget(results, budgets):
+    """``(size, scenario, queries, budget)`` of every scenario over its budget."""
+    return [
+        (size, scenario, result["queries"], budgets[scenario])
+        for size, scenarios in results.items()
+        for scenario, result in scenarios.items()
+        if scenario in budgets and result["queries"] > budgets[scenario]
+    ]
+
+
+def run_benchmarks(sizes, pos_per_vendor=20, iterations=50, seed=0, progress=None):
+    """
+    Grow the synthetic data set to each number of vendors in ``sizes`` and
+    benchmark the endpoints at that size. Returns the results by size.
+    """
+    results = {}
+    vendors = 0
+    for step, size in enumerate(sorted(sizes)):
+        generate_synthetic_data(
+            size - vendors, pos_per_vendor, seed + step, prefix=f"BENCH{step}"
+        )
+        vendors = size
+        key = f"{size}x{pos_per_vendor}"
+        results[key] = Benchmark(iterations, seed).run()
+        if progress:
+            progress(key, results[key])
+    return results
@@ -0,0 +1,98 @@
+import random
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.purchase_orders.line_items import create_line_items
+from api.purchase_orders.metrics import recompute_vendor_metrics
+from api.purchase_orders.models import PurchaseOrder
+from api.vendors.models import Vendor
+
+STATUS_WEIGHTS = {"completed": 70, "pending": 20, "cancelled": 10}
+SKUS = [f"SKU-{number:04d}" for number in range(1, 501)]
+
+
+def synthetic_purchase_order(rng, vendor, po_number, now):
+    """
+    A purchase order ordered in the last year, expected 3 to 14 days later.
+    Completed orders are delivered around the expected date (about 70% on
+    time) and mostly rated 3 to 5; 80% of the orders are acknowledged within
+    a few hours to a few days.
+    """
+    status = rng.choices(list(STATUS_WEIGHTS), weights=STATUS_WEIGHTS.values())[0]
+    order_date = now - timedelta(days=rng.uniform(15, 365))
+    expected_delivery_date = order_date + timedelta(days=rng.randint(3, 14))
+    delivery_date = quality_rating = acknowledgment_date = None
+    if status == "completed":
+        delivery_date = expected_delivery_date + timedelta(days=rng.gauss(-1, 2))
+        if rng.random() < 0.8:
+            quality_rating = round(min(5.0, max(1.0, rng.gauss(4.0, 0.8))), 1)
+    if status != "pending" or rng.random() < 0.8:
+        acknowledgment_date = order_date + timedelta(hours=rng.lognormvariate(2.5, 1.0))
+    items = {sku: rng.randint(1, 50) for sku in rng.sample(SKUS, rng.randint(1, 5))}
+    return PurchaseOrder(
+        po_number=po_number,
+        vendor=vendor,
+        order_date=order_date,
+        expected_delivery_date=expected_delivery_date,
+        delivery_date=delivery_date,
+        items=items,
+        quantity=sum(items.values()),
+        status=status,
+        quality_rating=quality_rating,
+        acknowledgment_date=acknowledgment_date,
+    )
+
+
+def generate_synthetic_data(
+    vendors, pos_per_vendor, seed=0, prefix="SYN", batch_size=1000, progress=None
+):
+    """
+    Create ``vendors`` vendors with ``pos_per_vendor`` purchase orders each,
+    the same ones for the same ``seed``, and compute their metrics. Vendor
+    codes and PO numbers start with ``prefix``, which must not be in use yet.
+    ``progress`` is called with the number of vendors done after each batch.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    vendors_per_batch = max(1, batch_size // max(1, pos_per_vendor))
+    done = 0
+    while done < vendors:
+        count = min(vendors_per_batch, vendors - done)
+        with transaction.atomic():
+            batch = Vendor.objects.bulk_create(
+                [
+                    Vendor(
+                        name=f"Vendor {prefix}-{number}",
+                        contact_details=f"vendor-{number}@example.com",
+                        address=f"{rng.randint(1, 999)} Market St, Springfield",
+                        vendor_code=f"{prefix}-{number:06d}",
+                    )
+                    for number in range(done, done + count)
+                ]
+            )
+            purchase_orders = PurchaseOrder.objects.bulk_create(
+                [
+                    synthetic_purchase_order(
+                        rng, vendor, f"{vendor.vendor_code}-{number:05d}", now
+                    )
+                    for vendor in batch
+                    for number in range(pos_per_vendor)
+                ],
+                batch_size=batch_size,
+            )
+            create_line_items(purchase_orders, batch_size=batch_size)
+            # issue_date is set to the creation time by bulk_create; orders
+            # are issued when they are placed.
+            PurchaseOrder.objects.filter(
+                pk__in=[po.pk for po in purchase_orders]
+            ).update(issue_date=F("order_date"))
+            recompute_vendor_metrics(
+                Vendor.objects.filter(pk__in=[vendor.pk for vendor in batch])
+            )
+        done += count
+        if progress:
+            progress(done)
+    return done
@@ -0,0 +1,47 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TransactionTestCase
+
+from api.benchmarks.runner import load_budgets, over_budget, run_benchmarks
+from api.purchase_orders.models import PurchaseOrder
+from api.vendors.models import Vendor
+
+
+class BenchmarkTestCase(TransactionTestCase):
+    # Not a TestCase: its savepoints would show up in the query counts.
+    databases = "__all__"
+
+    def test_generate_synthetic_data(self):
+        out = StringIO()
+        call_command(
+            "generate_synthetic_data",
+            "--vendors",
+            3,
+            "--pos-per-vendor",
+            20,
+            stdout=out,
+        )
+        self.assertIn("Created 3 vendors and 60 purchase orders", out.getvalue())
+        self.assertEqual(PurchaseOrder.objects.count(), 60)
+        self.assertEqual(
+            set(PurchaseOrder.objects.values_list("status", flat=True)),
+            {"completed", "pending", "cancelled"},
+        )
+        vendor = Vendor.objects.get(vendor_code="SYN-000000")
+        self.assertEqual(vendor.total_pos, 20)
+        self.assertGreater(vendor.fulfillment_rate, 0)
+
+        with self.assertRaises(CommandError):
+            call_command("generate_synthetic_data", "--vendors", 1, stdout=out)
+
+    def test_endpoints_stay_within_query_budgets(self):
+        results = run_benchmarks([2, 4], pos_per_vendor=5, iterations=3)
+        self.assertEqual(list(results), ["2x5", "4x5"])
+        self.assertEqual(results["2x5"]["po_list"]["requests"], 3)
+        self.assertEqual(over_budget(results, load_budgets()), [])
+        results["4x5"]["po_list"]["queries"] = 2
+        self.assertEqual(
+            over_budget(results, {"po_list": 1}), [("4x5", "po_list", 2, 1)]
+        )
@@ -0,0 +1,161 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.conf import settings
+
+DEFAULT_REQUEST_INSTRUMENTATION = {
+    # Requests slower than this are logged with their slowest queries.
+    "SLOW_REQUEST_MS": 500,
+    "SLOW_QUERIES": 5,
+    # Clients allowed to read /metrics.
+    "METRICS_ALLOWED_IPS": ["127.0.0.1", "::1"],
+    "BUCKETS": [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+}
+
+
+def instrumentation_settings():
+    return {
+        **DEFAULT_REQUEST_INSTRUMENTATION,
+        **getattr(settings, "REQUEST_INSTRUMENTATION", {}),
+    }
+
+
+class QueryRecorder:
+    """Number and total duration of the queries of one request, and the slowest."""
+
+    def __init__(self, keep_slowest):
+        self.count = 0
+        self.duration = 0.0
+        self.keep_slowest = keep_slowest
+        self._slowest = []
+
+    def add(self, sql, duration):
+        self.count += 1
+        self.duration += duration
+        entry = (duration, self.count, sql)
+        if len(self._slowest) < self.keep_slowest:
+            heapq.heappush(self._slowest, entry)
+        elif self._slowest and entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self):
+        """``(duration, sql)`` of the slowest queries, slowest first."""
+        return [(duration, sql) for duration, _, sql in sorted(self._slowest)[::-1]]
+
+
+# Set by the middleware for the duration of a request. Context variables follow
+# the request into the threads running its ORM calls under ASGI.
+current_recorder = ContextVar("current_recorder", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.add(sql, time.perf_counter() - started)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """``connection_created`` receiver adding ``record_query`` to the connection."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class RequestMetrics:
+    """
+    Per-route histograms of the request and SQL durations, and the number of
+    queries, of the requests served by this process.
+    """
+
+    histograms = {
+        "vms_request_duration_seconds": "Duration of the requests.",
+        "vms_request_db_seconds": "Time spent in SQL queries per request.",
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+    def observe(self, labels, duration, db_duration, queries):
+        buckets = instrumentation_settings()["BUCKETS"]
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {
+                    "vms_request_duration_seconds": Histogram(buckets),
+                    "vms_request_db_seconds": Histogram(buckets),
+                    "vms_request_queries_total": 0,
+                }
+            series["vms_request_duration_seconds"].observe(duration)
+            series["vms_request_db_seconds"].observe(db_duration)
+            series["vms_request_queries_total"] += queries
+
+    def render(self):
+        """The metrics in the Prometheus text exposition format."""
+        with self._lock:
+            series = sorted(self._series.items())
+            lines = []
+            for name, description in self.histograms.items():
+                lines += [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+                for labels, metrics in series:
+                    histogram = metrics[name]
+                    cumulative = 0
+                    for bound, count in zip(
+                        [*histogram.buckets, "+Inf"], histogram.counts
+                    ):
+                        cumulative += count
+                        le = _label_set({**dict(labels), "le": str(bound)})
+                        lines.append(f"{name}_bucket{le} {cumulative}")
+                    lines.append(f"{name}_sum{_label_set(labels)} {histogram.sum}")
+                    lines.append(f"{name}_count{_label_set(labels)} {cumulative}")
+            name = "vms_request_queries_total"
+            lines += [
+                f"# HELP {name} SQL queries run by the requests.",
+                f"# TYPE {name} counter",
+            ]
+            for labels, metrics in series:
+                lines.append(f"{name}{_label_set(labels)} {metrics[name]}")
+        return "\n".join(lines) + "\n"
+
+
+def _label_set(labels):
+    labels = dict(labels)
+    return (
+        "{"
+        + ",".join(
+            '{}="{}"'.format(
+                name,
+                str(value)
+                .replace("\\", "\\\\")
+                .replace('"', '\\"')
+                .replace("\n", "\\n"),
+            )
+            for name, value in labels.items()
+        )
+        + "}"
+    )
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.purchase_orders.line_items import backfill_line_items
+from api.purchase_orders.models import PurchaseOrder
+
+
+class Command(BaseCommand):
+    help = "Rebuild the purchase order line items (SKU index) from their items."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--vendor",
+            action="append",
+            type=int,
+            dest="vendor_ids",
+            help="Only rebuild the purchase orders of this vendor id "
+            "(can be repeated).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, vendor_ids=None, batch_size=1000, **options):
+        purchase_orders = PurchaseOrder.objects.all()
+        if vendor_ids:
+            purchase_orders = purchase_orders.filter(vendor_id__in=vendor_ids)
+
+        started = time.perf_counter()
+
+        def progress(done):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"Rebuilt {done} purchase orders ({done / elapsed:.0f} orders/s)"
+            )
+
+        total = backfill_line_items(purchase_orders, batch_size, progress)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt the line items of {total} purchase orders in {elapsed:.2f}s "
+                f"({total / elapsed if elapsed else 0:.0f} orders/s)"
+            )
+        )
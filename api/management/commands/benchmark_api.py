@@ -0,0 +1,98 @@
+import json
+import platform
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from api.benchmarks.runner import (
+    BUDGETS_FILE,
+    load_budgets,
+    over_budget,
+    run_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API endpoints on synthetic data of several sizes, in a "
+        "test database, and fail when one runs more queries than its budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="10,100,1000",
+            help="Comma-separated numbers of vendors to benchmark with.",
+        )
+        parser.add_argument("--pos-per-vendor", type=int, default=20)
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("-o", "--output", default="benchmark-results.json")
+        parser.add_argument("--budgets", default=str(BUDGETS_FILE))
+
+    def handle(
+        self,
+        *args,
+        sizes="10,100,1000",
+        pos_per_vendor=20,
+        iterations=50,
+        seed=0,
+        output="benchmark-results.json",
+        budgets=str(BUDGETS_FILE),
+        **options,
+    ):
+        try:
+            sizes = [int(size) for size in sizes.split(",")]
+        except ValueError:
+            raise CommandError(f"Invalid --sizes value: {sizes!r}")
+        budgets = load_budgets(budgets)
+
+        def progress(size, results):
+            self.stdout.write(f"{size}:")
+            for scenario, result in results.items():
+                self.stdout.write(
+                    f"  {scenario:<28} p50 {result['p50_ms']:>8.2f}ms  "
+                    f"p95 {result['p95_ms']:>8.2f}ms  "
+                    f"p99 {result['p99_ms']:>8.2f}ms  "
+                    f"{result['queries']} queries"
+                )
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = run_benchmarks(sizes, pos_per_vendor, iterations, seed, progress)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        with open(output, "w") as f:
+            json.dump(
+                {
+                    "created_at": timezone.now().isoformat(),
+                    "python": platform.python_version(),
+                    "django": django.get_version(),
+                    "database": connection.vendor,
+                    "pos_per_vendor": pos_per_vendor,
+                    "iterations": iterations,
+                    "budgets": budgets,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        self.stdout.write(f"Results written to {output}")
+
+        exceeded = over_budget(results, budgets)
+        if exceeded:
+            raise CommandError(
+                "Query budget exceeded: "
+                + ", ".join(
+                    f"{scenario} ran {queries} queries at {size} (budget {budget})"
+                    for size, scenario, queries, budget in exceeded
+                )
+            )
+        self.stdout.write(self.style.SUCCESS("All endpoints within their budgets."))
@@ -0,0 +1,37 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from api.benchmarks.renderers import compare_renderers, purchase_order_page
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the bytes/sec of the stdlib and fast JSON renderers on purchase "
+        "order list pages."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            default="100,1000",
+            help="Comma-separated numbers of orders per page.",
+        )
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("-o", "--output", help="Also write the results as JSON.")
+
+    def handle(self, *args, rows="100,1000", iterations=20, output=None, **options):
+        results = {}
+        for count in [int(count) for count in rows.split(",")]:
+            results[count] = compare_renderers(purchase_order_page(count), iterations)
+            baseline = results[count]["stdlib"]["bytes_per_sec"]
+            for name, result in results[count].items():
+                self.stdout.write(
+                    f"{count:>6} rows  {name:<7} "
+                    f"{result['bytes_per_sec'] / 1e6:>8.1f} MB/s  "
+                    f"{result['renders_per_sec']:>8.1f} renders/s  "
+                    f"x{result['bytes_per_sec'] / baseline:.1f}"
+                )
+        if output:
+            with open(output, "w") as f:
+                json.dump(results, f, indent=2)
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from api.purchase_orders.export import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    export_chunks,
+    export_fields,
+    export_queryset,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream purchase orders as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output-format", choices=EXPORT_FORMATS, default="ndjson")
+        parser.add_argument(
+            "-o", "--output", help="File to write to (default: stdout)."
+        )
+        parser.add_argument("--vendor", type=int)
+        parser.add_argument("--status")
+        parser.add_argument(
+            "--from", dest="order_date__gte", help="Minimum order date."
+        )
+        parser.add_argument("--to", dest="order_date__lte", help="Maximum order date.")
+        parser.add_argument("--fields", help="Comma separated fields to export.")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        params = {
+            name: options[name]
+            for name in ("vendor", "status", "order_date__gte", "order_date__lte")
+        }
+        try:
+            fields = export_fields(options["fields"])
+            queryset = export_queryset(params, fields)
+        except ValidationError as exc:
+            raise CommandError(
+                "; ".join(
+                    f"{name}: {' '.join(map(str, messages))}"
+                    for name, messages in exc.detail.items()
+                )
+            )
+
+        started = time.perf_counter()
+        chunks = export_chunks(
+            queryset, fields, options["output_format"], options["chunk_size"]
+        )
+        if options["output"]:
+            with open(options["output"], "w", newline="") as out:
+                out.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+        self.stderr.write(f"Exported in {time.perf_counter() - started:.2f}s")
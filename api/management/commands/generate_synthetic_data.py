@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmarks.synthetic import generate_synthetic_data
+from api.vendors.models import Vendor
+
+
+class Command(BaseCommand):
+    help = (
+        "Create vendors with purchase orders under realistic status, rating and "
+        "date distributions, for load tests and benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--vendors", type=int, default=100)
+        parser.add_argument("--pos-per-vendor", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--prefix",
+            default="SYN",
+            help="Prefix of the vendor codes and PO numbers created.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(
+        self,
+        *args,
+        vendors=100,
+        pos_per_vendor=50,
+        seed=0,
+        prefix="SYN",
+        batch_size=1000,
+        **options,
+    ):
+        if Vendor.objects.filter(vendor_code__startswith=f"{prefix}-").exists():
+            raise CommandError(
+                f"Vendors with the prefix {prefix!r} already exist, use --prefix."
+            )
+
+        started = time.perf_counter()
+
+        def progress(done):
+            self.stdout.write(f"Created {done} vendors")
+
+        generate_synthetic_data(
+            vendors, pos_per_vendor, seed, prefix, batch_size, progress
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {vendors} vendors and {vendors * pos_per_vendor} "
+                f"purchase orders in {elapsed:.2f}s"
+            )
+        )
@@ -0,0 +1,80 @@
+import json
+import sys
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from api.vendors.imports import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_ERRORS,
+    IMPORT_FORMATS,
+    import_format,
+    import_vendors,
+)
+
+
+class Command(BaseCommand):
+    help = "Create or update (on vendor_code) vendors from a CSV or JSONL file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, - for stdin.")
+        parser.add_argument(
+            "--input-format",
+            choices=IMPORT_FORMATS,
+            help="Default: from the file extension, else csv.",
+        )
+        parser.add_argument(
+            "--start-line",
+            type=int,
+            default=1,
+            help="Skip the rows before this line, to resume an interrupted import.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--max-errors", type=int, default=DEFAULT_MAX_ERRORS)
+
+    def handle(self, *args, path, **options):
+        input_format = options["input_format"] or import_format(path)
+        reported = 0
+
+        def progress(report):
+            nonlocal reported
+            for error in report.errors[reported:]:
+                self.stderr.write(
+                    f"Line {error['line']}: {json.dumps(error['errors'])}"
+                )
+            reported = len(report.errors)
+            self.stdout.write(
+                f"Imported up to line {report.last_line}: {report.rows} rows, "
+                f"{report.failed} failed ({report.rows_per_second:.0f} rows/s)"
+            )
+
+        if path == "-":
+            source = nullcontext(sys.stdin)
+        else:
+            try:
+                source = open(path, newline="", encoding="utf-8-sig")
+            except OSError as exc:
+                raise CommandError(exc)
+        try:
+            with source as lines:
+                report = import_vendors(
+                    lines,
+                    input_format,
+                    start_line=options["start_line"],
+                    chunk_size=options["chunk_size"],
+                    max_errors=options["max_errors"],
+                    progress=progress,
+                )
+        except ValidationError as exc:
+            raise CommandError(" ".join(map(str, exc.detail["file"])))
+
+        if report.failed > len(report.errors):
+            self.stderr.write(f"{report.failed - len(report.errors)} more rows failed.")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.rows} rows in {report.elapsed:.2f}s "
+                f"({report.rows_per_second:.0f} rows/s): {report.created} created, "
+                f"{report.updated} updated, {report.failed} failed"
+            )
+        )
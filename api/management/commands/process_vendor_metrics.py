@@ -0,0 +1,119 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from operator import or_
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Q
+
+from api.purchase_orders.metrics import recompute_vendor_metrics
+from api.vendors.models import DirtyVendor, Vendor
+
+
+def _recompute(vendor_ids):
+    return recompute_vendor_metrics(Vendor.objects.filter(pk__in=vendor_ids))
+
+
+def _recompute_in_thread(vendor_ids):
+    try:
+        return _recompute(vendor_ids)
+    finally:
+        connections.close_all()
+
+
+def drain_dirty_vendors(batch_size, executor=None, workers=1):
+    """
+    Recompute one batch of queued vendors and return its size. Each vendor is
+    recomputed once however many times it was marked; one marked again while
+    it was recomputed stays queued for the next batch.
+    """
+    claimed = dict(
+        DirtyVendor.objects.order_by("marked_at").values_list(
+            "vendor_id", "last_marked_at"
+        )[:batch_size]
+    )
+    if not claimed:
+        return 0
+    vendor_ids = list(claimed)
+    if executor is None:
+        _recompute(vendor_ids)
+    else:
+        chunk_size = -(-len(vendor_ids) // workers)
+        chunks = [
+            vendor_ids[start : start + chunk_size]
+            for start in range(0, len(vendor_ids), chunk_size)
+        ]
+        list(executor.map(_recompute_in_thread, chunks))
+    DirtyVendor.objects.filter(
+        reduce(
+            or_,
+            (
+                Q(vendor_id=vendor_id, last_marked_at=last_marked_at)
+                for vendor_id, last_marked_at in claimed.items()
+            ),
+        )
+    ).delete()
+    return len(claimed)
+
+
+class Command(BaseCommand):
+    help = "Recompute the metrics of the vendors queued in deferred metrics mode."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit once the queue is empty."
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Only print the queue depth and lag.",
+        )
+
+    def write_stats(self):
+        self.stdout.write(
+            f"Queue depth: {DirtyVendor.objects.count()}, "
+            f"lag: {DirtyVendor.objects.lag():.2f}s"
+        )
+
+    def handle(
+        self,
+        *args,
+        workers=4,
+        batch_size=500,
+        interval=1.0,
+        once=False,
+        stats=False,
+        **options,
+    ):
+        if stats:
+            self.write_stats()
+            return
+
+        executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while True:
+                self.write_stats()
+                started = time.perf_counter()
+                done = drain_dirty_vendors(batch_size, executor, workers)
+                if done:
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"Recomputed {done} vendors in {elapsed:.2f}s "
+                        f"({done / elapsed if elapsed else 0:.0f} vendors/s)"
+                    )
+                elif once:
+                    break
+                else:
+                    time.sleep(interval)
+        finally:
+            if executor is not None:
+                executor.shutdown()
@@ -0,0 +1,70 @@
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from api.purchase_orders.metrics import recompute_vendor_metrics
+from api.vendors.models import Vendor
+
+
+def parse_since(value):
+    since = parse_datetime(value)
+    if since is None:
+        date = parse_date(value)
+        if date is None:
+            raise CommandError(f"Invalid --since value: {value!r}")
+        since = datetime.combine(date, datetime.min.time())
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+class Command(BaseCommand):
+    help = "Recompute the performance metrics of vendors from their purchase orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--vendor",
+            action="append",
+            type=int,
+            dest="vendor_ids",
+            help="Only recompute this vendor id (can be repeated).",
+        )
+        parser.add_argument(
+            "--since",
+            help="Only recompute vendors with purchase orders issued, "
+            "acknowledged or delivered since this date or datetime.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, vendor_ids=None, since=None, batch_size=500, **options):
+        vendors = Vendor.objects.all()
+        if vendor_ids:
+            vendors = vendors.filter(pk__in=vendor_ids)
+        if since:
+            since = parse_since(since)
+            vendors = vendors.filter(
+                Q(purchaseorder__issue_date__gte=since)
+                | Q(purchaseorder__acknowledgment_date__gte=since)
+                | Q(purchaseorder__delivery_date__gte=since)
+            ).distinct()
+
+        started = time.perf_counter()
+
+        def progress(done):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"Recomputed {done} vendors ({done / elapsed:.0f} vendors/s)"
+            )
+
+        total = recompute_vendor_metrics(vendors, batch_size, progress)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recomputed {total} vendors in {elapsed:.2f}s "
+                f"({total / elapsed if elapsed else 0:.0f} vendors/s)"
+            )
+        )
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.vendors.history import prune_history, record_vendor_history
+
+
+class Command(BaseCommand):
+    help = (
+        "Record a performance history sample of the vendors whose metrics "
+        "changed since their last one (metric updates record their own, this "
+        "catches up on missed ones), and delete the expired history."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep running, sampling every this many seconds.",
+        )
+
+    def handle(self, *args, batch_size=500, interval=None, **options):
+        while True:
+            started = time.perf_counter()
+            sampled = record_vendor_history(batch_size=batch_size)
+            pruned = prune_history()
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"Sampled {sampled} vendors and deleted {pruned} expired history "
+                f"rows in {elapsed:.2f}s"
+            )
+            if interval is None:
+                break
+            time.sleep(max(interval - elapsed, 0))
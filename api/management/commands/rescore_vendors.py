@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.vendors.models import Vendor
+from api.vendors.scoring import rescore_vendors
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the vendor performance scores from their metrics, "
+        "e.g. after changing settings.VENDOR_SCORE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--vendor",
+            action="append",
+            type=int,
+            dest="vendor_ids",
+            help="Only rescore this vendor id (can be repeated).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, vendor_ids=None, batch_size=1000, **options):
+        vendors = Vendor.objects.all()
+        if vendor_ids:
+            vendors = vendors.filter(pk__in=vendor_ids)
+
+        started = time.perf_counter()
+
+        def progress(done):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"Rescored {done} vendors ({done / elapsed:.0f} vendors/s)"
+            )
+
+        total = rescore_vendors(vendors, batch_size, progress)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rescored {total} vendors in {elapsed:.2f}s "
+                f"({total / elapsed if elapsed else 0:.0f} vendors/s)"
+            )
+        )
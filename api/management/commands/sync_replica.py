@@ -0,0 +1,50 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def backup_sqlite(source, target_path):
+    """Copy the SQLite database of the ``source`` connection to ``target_path``."""
+    source.ensure_connection()
+    target = sqlite3.connect(target_path)
+    try:
+        source.connection.backup(target)
+    finally:
+        target.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the SQLite primary database to the replica, as a local stand-in "
+        "for replication."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep copying every this many seconds instead of once.",
+        )
+
+    def handle(self, *args, interval=None, **options):
+        replica = settings.REPLICA_DATABASE
+        if not replica:
+            raise CommandError("No replica configured, set VMS_DB_REPLICA_NAME.")
+        source = connections[DEFAULT_DB_ALIAS]
+        if source.vendor != "sqlite" or connections[replica].vendor != "sqlite":
+            raise CommandError("sync_replica only copies SQLite databases.")
+
+        target_path = connections[replica].settings_dict["NAME"]
+        while True:
+            started = time.perf_counter()
+            backup_sqlite(source, target_path)
+            self.stdout.write(
+                f"Copied {source.settings_dict['NAME']} to {target_path} "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+            if interval is None:
+                break
+            time.sleep(interval)
@@ -0,0 +1,219 @@
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+from vms.db_routers import request_routing
+
+from .instrumentation import (
+    QueryRecorder,
+    current_recorder,
+    instrumentation_settings,
+    request_metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncReadViewsMiddleware:
+    """
+    Resolve ASGI requests against ``ASYNC_READ_URLCONF``, which serves the read
+    endpoints with async views, so they don't take a thread from the sync pool.
+    WSGI requests keep using ``ROOT_URLCONF``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if settings.ASYNC_READ_URLCONF:
+            request.urlconf = settings.ASYNC_READ_URLCONF
+        return await self.get_response(request)
+
+
+class DatabaseRoutingMiddleware:
+    """
+    Let ``vms.db_routers.PrimaryReplicaRouter`` send the reads of the request
+    to the replica until it writes. Requests with an unsafe method read from
+    the primary from the start, so that their validation sees the latest data.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with request_routing(pinned=request.method not in SAFE_METHODS):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with request_routing(pinned=request.method not in SAFE_METHODS):
+            return await self.get_response(request)
+
+
+class RequestTiming:
+    def __init__(self, keep_slowest):
+        self.started = time.perf_counter()
+        self.recorder = QueryRecorder(keep_slowest)
+        self.view_started = self.view_ended = self.rendered = None
+
+    @contextmanager
+    def rendering(self):
+        """Time the rendering of a response that a view renders itself."""
+        self.view_ended = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.rendered = time.perf_counter()
+
+    def durations(self):
+        """Total, view and render durations in seconds."""
+        ended = time.perf_counter()
+        view = render = 0.0
+        if self.view_started is not None:
+            view = (self.view_ended or ended) - self.view_started
+        if self.view_ended is not None and self.rendered is not None:
+            render = self.rendered - self.view_ended
+        return ended - self.started, view, render
+
+
+def rendering(request):
+    """
+    Context manager timing the ``render`` phase of ``request`` for views that
+    render their response themselves (``api.async_views``).
+    """
+    timing = getattr(request, "timing", None)
+    return nullcontext() if timing is None else timing.rendering()
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Record the number and duration of the SQL queries, the view time and the
+    render time of every request. The view time includes serialization: DRF
+    views and the async views build the response data with their serializers
+    in the view. The render time is the encoding of that data, by the template
+    response (DRF renderers) or by ``rendering()`` in views that render
+    themselves. They are sent in a ``Server-Timing`` header, requests slower than
+    ``REQUEST_INSTRUMENTATION["SLOW_REQUEST_MS"]`` are logged with their
+    slowest queries, and ``api.instrumentation.request_metrics`` aggregates
+    them per route for ``/metrics``. Should come first in ``MIDDLEWARE``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Django would run the sync hooks in a thread.
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timing = request.timing = RequestTiming(self.keep_slowest())
+        token = current_recorder.set(timing.recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        return self.finish(request, response, timing)
+
+    async def __acall__(self, request):
+        timing = request.timing = RequestTiming(self.keep_slowest())
+        token = current_recorder.set(timing.recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_recorder.reset(token)
+        return self.finish(request, response, timing)
+
+    def keep_slowest(self):
+        return instrumentation_settings()["SLOW_QUERIES"]
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.timing.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timing = request.timing
+        timing.view_ended = time.perf_counter()
+
+        def rendered(response):
+            timing.rendered = time.perf_counter()
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    # The same hooks as coroutines, set on the instance in async mode.
+
+    async def aprocess_view(self, *args):
+        return RequestInstrumentationMiddleware.process_view(self, *args)
+
+    async def aprocess_template_response(self, *args):
+        return RequestInstrumentationMiddleware.process_template_response(self, *args)
+
+    def finish(self, request, response, timing):
+        total, view, render = timing.durations()
+        recorder = timing.recorder
+        response["Server-Timing"] = ", ".join(
+            [
+                f"db;dur={recorder.duration * 1000:.2f};"
+                f'desc="{recorder.count} queries"',
+                f'view;dur={view * 1000:.2f};desc="view and serialization"',
+                f'render;dur={render * 1000:.2f};desc="response encoding"',
+                f"total;dur={total * 1000:.2f}",
+            ]
+        )
+
+        match = request.resolver_match
+        route = (match.view_name or match.route) if match else "unmatched"
+        request_metrics.observe(
+            (
+                ("method", request.method),
+                ("route", route),
+                ("status", str(response.status_code)),
+            ),
+            total,
+            recorder.duration,
+            recorder.count,
+        )
+
+        if total * 1000 >= instrumentation_settings()["SLOW_REQUEST_MS"]:
+            logger.warning(
+                "Slow request: %s %s (%s) %.0fms, %d queries in %.0fms, "
+                "view %.0fms, render %.0fms%s",
+                request.method,
+                request.path,
+                response.status_code,
+                total * 1000,
+                recorder.count,
+                recorder.duration * 1000,
+                view * 1000,
+                render * 1000,
+                "".join(
+                    f"\n  {duration * 1000:.1f}ms {sql}"
+                    for duration, sql in recorder.slowest()
+                ),
+            )
+        return response
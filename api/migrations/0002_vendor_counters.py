@@ -0,0 +1,67 @@
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, F, Q, Sum
+
+
+def backfill_vendor_counters(apps, schema_editor):
+    Vendor = apps.get_model("api", "Vendor")
+    PurchaseOrder = apps.get_model("api", "PurchaseOrder")
+    completed = Q(status="completed")
+    rows = PurchaseOrder.objects.values("vendor_id").annotate(
+        total_pos=Count("id"),
+        completed_pos=Count("id", filter=completed),
+        on_time_pos=Count(
+            "id", filter=completed & Q(delivery_date__lte=F("expected_delivery_date"))
+        ),
+        quality_rating_sum=Sum("quality_rating", filter=completed, default=0.0),
+        quality_rating_count=Count("quality_rating", filter=completed),
+    )
+    for row in rows:
+        Vendor.objects.filter(pk=row.pop("vendor_id")).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="purchaseorder",
+            name="expected_delivery_date",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name="purchaseorder",
+            name="delivery_date",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="vendor",
+            name="completed_pos",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="vendor",
+            name="on_time_pos",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="vendor",
+            name="quality_rating_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="vendor",
+            name="quality_rating_sum",
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="vendor",
+            name="total_pos",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_vendor_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations, models
+from django.db.models import Count, F, Q, Sum
+
+
+def backfill_response_time_counters(apps, schema_editor):
+    Vendor = apps.get_model("api", "Vendor")
+    PurchaseOrder = apps.get_model("api", "PurchaseOrder")
+    rows = PurchaseOrder.objects.values("vendor_id").annotate(
+        response_time_total=Sum(
+            F("acknowledgment_date") - F("issue_date"),
+            filter=Q(acknowledgment_date__isnull=False),
+        ),
+        acknowledged_pos=Count("acknowledgment_date"),
+    )
+    for row in rows:
+        if row["acknowledged_pos"]:
+            Vendor.objects.filter(pk=row["vendor_id"]).update(
+                response_time_total=row["response_time_total"].total_seconds(),
+                acknowledged_pos=row["acknowledged_pos"],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_vendor_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vendor",
+            name="acknowledged_pos",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="vendor",
+            name="response_time_total",
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.RunPython(
+            backfill_response_time_counters, migrations.RunPython.noop
+        ),
+    ]
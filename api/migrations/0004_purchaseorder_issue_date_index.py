@@ -0,0 +1,19 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_vendor_response_time_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(
+                fields=["issue_date", "id"], name="api_po_issue_date_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0004_purchaseorder_issue_date_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="purchaseorder",
+            name="vendor",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="api.vendor",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(
+                fields=["vendor", "status"], name="api_po_vendor_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(
+                fields=["vendor", "acknowledgment_date"], name="api_po_vendor_ack_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(
+                condition=models.Q(("acknowledgment_date__isnull", True)),
+                fields=["vendor", "issue_date"],
+                name="api_po_vendor_unack_idx",
+            ),
+        ),
+    ]
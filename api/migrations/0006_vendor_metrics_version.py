@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_purchaseorder_vendor_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vendor",
+            name="metrics_version",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
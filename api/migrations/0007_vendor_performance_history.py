@@ -0,0 +1,123 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0006_vendor_metrics_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyPerformanceRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket_start", models.DateTimeField()),
+                ("samples", models.PositiveIntegerField(default=0)),
+                ("on_time_delivery_rate", models.FloatField(default=0.0)),
+                ("quality_rating_avg", models.FloatField(default=0.0)),
+                ("average_response_time", models.FloatField(default=0.0)),
+                ("fulfillment_rate", models.FloatField(default=0.0)),
+                ("on_time_delivery_rate_sum", models.FloatField(default=0.0)),
+                ("quality_rating_avg_sum", models.FloatField(default=0.0)),
+                ("average_response_time_sum", models.FloatField(default=0.0)),
+                ("fulfillment_rate_sum", models.FloatField(default=0.0)),
+                (
+                    "vendor",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="api.vendor",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="HistoricalPerformance",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateTimeField()),
+                ("on_time_delivery_rate", models.FloatField()),
+                ("quality_rating_avg", models.FloatField()),
+                ("average_response_time", models.FloatField()),
+                ("fulfillment_rate", models.FloatField()),
+                (
+                    "vendor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="performance_history",
+                        to="api.vendor",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="MonthlyPerformanceRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket_start", models.DateTimeField()),
+                ("samples", models.PositiveIntegerField(default=0)),
+                ("on_time_delivery_rate", models.FloatField(default=0.0)),
+                ("quality_rating_avg", models.FloatField(default=0.0)),
+                ("average_response_time", models.FloatField(default=0.0)),
+                ("fulfillment_rate", models.FloatField(default=0.0)),
+                ("on_time_delivery_rate_sum", models.FloatField(default=0.0)),
+                ("quality_rating_avg_sum", models.FloatField(default=0.0)),
+                ("average_response_time_sum", models.FloatField(default=0.0)),
+                ("fulfillment_rate_sum", models.FloatField(default=0.0)),
+                (
+                    "vendor",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="api.vendor",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="dailyperformancerollup",
+            constraint=models.UniqueConstraint(
+                fields=("vendor", "bucket_start"), name="api_daily_rollup_bucket_uniq"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalperformance",
+            index=models.Index(
+                fields=["vendor", "date"], name="api_history_vendor_date_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="monthlyperformancerollup",
+            constraint=models.UniqueConstraint(
+                fields=("vendor", "bucket_start"), name="api_monthly_rollup_bucket_uniq"
+            ),
+        ),
+    ]
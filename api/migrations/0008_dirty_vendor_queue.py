@@ -0,0 +1,37 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0007_vendor_performance_history"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DirtyVendor",
+            fields=[
+                (
+                    "vendor",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        serialize=False,
+                        to="api.vendor",
+                    ),
+                ),
+                ("marked_at", models.DateTimeField()),
+                ("last_marked_at", models.DateTimeField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["marked_at"], name="api_dirty_vendor_marked_idx"
+                    )
+                ],
+            },
+        ),
+    ]
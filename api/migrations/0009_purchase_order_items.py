@@ -0,0 +1,65 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0008_dirty_vendor_queue"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PurchaseOrderItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sku", models.CharField(max_length=255)),
+                ("quantity", models.IntegerField()),
+                ("status", models.CharField(max_length=100)),
+                (
+                    "purchase_order",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="line_items",
+                        to="api.purchaseorder",
+                    ),
+                ),
+                (
+                    "vendor",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="api.vendor",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["sku", "vendor"], name="api_po_item_sku_vendor_idx"
+                    ),
+                    models.Index(
+                        fields=["sku", "status"], name="api_po_item_sku_status_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="purchaseorderitem",
+            constraint=models.UniqueConstraint(
+                fields=("purchase_order", "sku"), name="api_po_item_sku_uniq"
+            ),
+        ),
+    ]
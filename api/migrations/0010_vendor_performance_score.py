@@ -0,0 +1,67 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:49
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, F, FloatField, Value, When
+
+# api.vendors.scoring as of this migration.
+DEFAULT_WEIGHTS = {
+    "on_time_delivery_rate": 0.35,
+    "quality_rating_avg": 0.35,
+    "average_response_time": 0.1,
+    "fulfillment_rate": 0.2,
+}
+DEFAULT_RESPONSE_TIME_SCALE = 86400
+
+
+def backfill_performance_scores(apps, schema_editor):
+    Vendor = apps.get_model("api", "Vendor")
+    config = getattr(settings, "VENDOR_SCORE", {})
+    weights = {
+        metric: weight
+        for metric, weight in config.get("WEIGHTS", DEFAULT_WEIGHTS).items()
+        if weight
+    }
+    total = sum(weights.values())
+    if not total:
+        return
+    scale = float(config.get("RESPONSE_TIME_SCALE", DEFAULT_RESPONSE_TIME_SCALE))
+    normalized = {
+        "on_time_delivery_rate": F("on_time_delivery_rate") / 100.0,
+        "quality_rating_avg": F("quality_rating_avg") / 5.0,
+        "average_response_time": Case(
+            When(
+                acknowledged_pos__gt=0,
+                then=Value(scale) / (F("average_response_time") + Value(scale)),
+            ),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+        "fulfillment_rate": F("fulfillment_rate") / 100.0,
+    }
+    score = Value(0.0)
+    for metric, weight in weights.items():
+        score = score + normalized[metric] * (100.0 * weight / total)
+    Vendor.objects.update(performance_score=score)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0009_purchase_order_items"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vendor",
+            name="performance_score",
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="vendor",
+            index=models.Index(
+                fields=["-performance_score", "id"], name="api_vendor_score_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_performance_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-18 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0010_vendor_performance_score"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vendor",
+            name="history_version",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,69 @@
+from rest_framework.response import Response
+
+from api.serializers import row_serializer, sparse_fields, sparse_queryset, trim_fields
+
+
+def _ordering(paginator):
+    ordering = getattr(paginator, "ordering", None) or ()
+    return (ordering,) if isinstance(ordering, str) else tuple(ordering)
+
+
+class SparseFieldsMixin:
+    """
+    ``?fields=`` and ``?exclude=`` (comma separated field names) on ``list``
+    and ``retrieve``: the other fields are left out of the response, and their
+    columns are not loaded.
+    """
+
+    sparse_actions = ("list", "retrieve")
+
+    def get_sparse_fields(self):
+        if self.action not in self.sparse_actions:
+            return None
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = sparse_fields(
+                self.get_serializer_class(), self.request.query_params
+            )
+        return self._sparse_fields
+
+    def get_queryset(self):
+        return sparse_queryset(
+            super().get_queryset(),
+            self.get_serializer_class(),
+            self.get_sparse_fields(),
+            _ordering(self.paginator),
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if "data" not in kwargs:
+            trim_fields(serializer, self.get_sparse_fields())
+        return serializer
+
+
+class FastListMixin:
+    """
+    Serve ``list`` from ``values()`` rows formatted by a ``RowSerializer``
+    instead of model instances and a serializer per row. The payload is the
+    same as the serializer's. Views whose serializer cannot be compiled, or
+    with ``fast_list = False``, list as usual.
+    """
+
+    fast_list = True
+
+    def get_sparse_fields(self):
+        # Overridden by SparseFieldsMixin.
+        return None
+
+    def list(self, request, *args, **kwargs):
+        rows = row_serializer(self.get_serializer_class()) if self.fast_list else None
+        if rows is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = rows.only(self.get_sparse_fields())
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = rows.values(queryset, _ordering(self.paginator))
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(rows.many(queryset))
+        return self.get_paginated_response(rows.many(page))
@@ -0,0 +1,22 @@
+from asgiref.sync import sync_to_async
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset pagination: every page is a range scan on an indexed ordering, so
+    deep pages cost the same as the first one. The cursor is opaque.
+    """
+
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for the async views, run in a thread."""
+        return await sync_to_async(self.paginate_queryset)(queryset, request, view)
+
+
+class IssueDateCursorPagination(IdCursorPagination):
+    # Newest first; id breaks ties between orders issued at the same time.
+    ordering = ("-issue_date", "-id")
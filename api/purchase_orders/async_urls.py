@@ -0,0 +1,39 @@
+from django.urls import URLPattern, path, re_path
+
+from . import urls
+from .views import (
+    AsyncExportPurchaseOrderView,
+    AsyncPurchaseOrderDetailView,
+    AsyncPurchaseOrderListView,
+    ExportPurchaseOrderAPIView,
+)
+
+# Same routes as ``urls``, with async views for the reads and the export; the
+# other methods and routes are still served by the sync views. The plain routes
+# come before their format suffix variants, hence ``reversed``.
+sync_views = {pattern.name: pattern.callback for pattern in reversed(urls.router.urls)}
+
+urlpatterns = [
+    path(
+        "export/",
+        AsyncExportPurchaseOrderView.as_view(
+            sync_view=ExportPurchaseOrderAPIView.as_view()
+        ),
+        name="export_purchase_orders",
+    ),
+    # bulk/, items/ and the other routes would otherwise match the detail route.
+    *(pattern for pattern in urls.urlpatterns if isinstance(pattern, URLPattern)),
+    re_path(
+        r"^$",
+        AsyncPurchaseOrderListView.as_view(sync_view=sync_views["purchaseorder-list"]),
+        name="purchaseorder-list",
+    ),
+    re_path(
+        r"^(?P<pk>[^/.]+)/$",
+        AsyncPurchaseOrderDetailView.as_view(
+            sync_view=sync_views["purchaseorder-detail"]
+        ),
+        name="purchaseorder-detail",
+    ),
+    *(pattern for pattern in urls.urlpatterns if not isinstance(pattern, URLPattern)),
+]
@@ -0,0 +1,49 @@
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+# Whitelisted query parameters: name -> (queryset lookup, parsing field).
+FILTERS = {
+    "vendor": ("vendor_id", serializers.IntegerField()),
+    "status": ("status", serializers.CharField()),
+    "acknowledgment_date__isnull": (
+        "acknowledgment_date__isnull",
+        serializers.BooleanField(),
+    ),
+    **{
+        f"{field}__{lookup}": (f"{field}__{lookup}", serializers.DateTimeField())
+        for field in (
+            "order_date",
+            "expected_delivery_date",
+            "delivery_date",
+            "issue_date",
+            "acknowledgment_date",
+        )
+        for lookup in ("gte", "lte")
+    },
+}
+
+
+def filter_purchase_orders(queryset, params):
+    """
+    Apply the whitelisted filters present in ``params`` (a query dict) to a
+    purchase order queryset. Unknown parameters are ignored; invalid values
+    raise a ``ValidationError`` keyed by parameter name.
+    """
+    lookups = {}
+    errors = {}
+    for name, (lookup, field) in FILTERS.items():
+        value = params.get(name)
+        if value in (None, ""):
+            continue
+        try:
+            lookups[lookup] = field.run_validation(value)
+        except serializers.ValidationError as exc:
+            errors[name] = exc.detail
+    if errors:
+        raise serializers.ValidationError(errors)
+    return queryset.filter(**lookups)
+
+
+class PurchaseOrderFilterBackend(BaseFilterBackend):
+    def filter_queryset(self, request, queryset, view):
+        return filter_purchase_orders(queryset, request.query_params)
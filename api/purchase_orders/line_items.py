@@ -0,0 +1,112 @@
+import json
+
+from django.db import transaction
+
+from .models import PurchaseOrder, PurchaseOrderItem
+
+# Purchase order fields its line items are derived from.
+LINE_ITEM_FIELDS = ("items", "vendor", "status")
+
+
+def _quantity(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return None
+    return None
+
+
+def parse_items(items):
+    """
+    SKU -> quantity of a ``PurchaseOrder.items`` value: a mapping of SKU to
+    quantity, a list of ``{"sku": ..., "quantity": ...}`` objects, or either
+    one encoded as a JSON string. Entries without an integer quantity are
+    left out and repeated SKUs are summed.
+    """
+    if isinstance(items, str):
+        try:
+            items = json.loads(items)
+        except ValueError:
+            return {}
+    if isinstance(items, dict):
+        entries = items.items()
+    elif isinstance(items, list):
+        entries = [
+            (entry.get("sku"), entry.get("quantity"))
+            for entry in items
+            if isinstance(entry, dict)
+        ]
+    else:
+        return {}
+    lines = {}
+    for sku, quantity in entries:
+        quantity = _quantity(quantity)
+        if sku is None or sku == "" or quantity is None:
+            continue
+        sku = str(sku)
+        lines[sku] = lines.get(sku, 0) + quantity
+    return lines
+
+
+def build_line_items(purchase_orders):
+    return [
+        PurchaseOrderItem(
+            purchase_order_id=purchase_order.pk,
+            sku=sku,
+            quantity=quantity,
+            vendor_id=purchase_order.vendor_id,
+            status=purchase_order.status,
+        )
+        for purchase_order in purchase_orders
+        for sku, quantity in parse_items(purchase_order.items).items()
+    ]
+
+
+def create_line_items(purchase_orders, batch_size=None):
+    """Add the line items of purchase orders that have none yet."""
+    return len(
+        PurchaseOrderItem.objects.bulk_create(
+            build_line_items(purchase_orders), batch_size=batch_size
+        )
+    )
+
+
+def sync_line_items(purchase_orders, batch_size=None):
+    """Replace the line items of purchase orders with the ones of their items."""
+    PurchaseOrderItem.objects.filter(
+        purchase_order__in=[purchase_order.pk for purchase_order in purchase_orders]
+    ).delete()
+    return create_line_items(purchase_orders, batch_size)
+
+
+def backfill_line_items(purchase_orders=None, batch_size=1000, progress=None):
+    """
+    Rebuild the line items of ``purchase_orders`` (all of them by default) in
+    batches of ``batch_size`` orders, walking them by primary key. ``progress``
+    is called with the number of orders done after each batch.
+    """
+    if purchase_orders is None:
+        purchase_orders = PurchaseOrder.objects.all()
+    purchase_orders = purchase_orders.only("pk", *LINE_ITEM_FIELDS).order_by("pk")
+    done = 0
+    last_pk = None
+    while True:
+        batch = purchase_orders
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        batch = list(batch[:batch_size])
+        if not batch:
+            return done
+        with transaction.atomic():
+            sync_line_items(batch)
+        done += len(batch)
+        last_pk = batch[-1].pk
+        if progress:
+            progress(done)
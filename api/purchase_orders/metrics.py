@@ -0,0 +1,300 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Q, Sum, Value, When
+
+from api.vendors.cache import invalidate_vendor_performance
+from api.vendors.history import record_history_on_commit
+from api.vendors.models import PERFORMANCE_METRICS, DirtyVendor, Vendor
+from api.vendors.scoring import performance_score
+
+from .models import PurchaseOrder
+
+COMPLETED = "completed"
+
+# Running counters kept on the vendor, one entry per purchase order.
+COUNTER_FIELDS = (
+    "total_pos",
+    "completed_pos",
+    "on_time_pos",
+    "quality_rating_sum",
+    "quality_rating_count",
+    "response_time_total",
+    "acknowledged_pos",
+)
+
+EMPTY_COUNTERS = dict.fromkeys(COUNTER_FIELDS, 0)
+
+# Purchase order fields the counters above depend on.
+SOURCE_FIELDS = (
+    "vendor_id",
+    "status",
+    "delivery_date",
+    "expected_delivery_date",
+    "quality_rating",
+    "issue_date",
+    "acknowledgment_date",
+)
+
+
+def contribution(
+    status,
+    delivery_date,
+    expected_delivery_date,
+    quality_rating,
+    issue_date,
+    acknowledgment_date,
+):
+    completed = status == COMPLETED
+    on_time = (
+        completed
+        and delivery_date is not None
+        and expected_delivery_date is not None
+        and delivery_date <= expected_delivery_date
+    )
+    rated = completed and quality_rating is not None
+    acknowledged = acknowledgment_date is not None and issue_date is not None
+    return {
+        "total_pos": 1,
+        "completed_pos": int(completed),
+        "on_time_pos": int(on_time),
+        "quality_rating_sum": quality_rating if rated else 0.0,
+        "quality_rating_count": int(rated),
+        "response_time_total": (
+            (acknowledgment_date - issue_date).total_seconds() if acknowledged else 0.0
+        ),
+        "acknowledged_pos": int(acknowledged),
+    }
+
+
+def source_values(purchase_order):
+    return {field: getattr(purchase_order, field) for field in SOURCE_FIELDS}
+
+
+def vendor_deltas(old=None, new=None):
+    """
+    Counter deltas per vendor for a purchase order going from ``old`` to
+    ``new``, both given as ``source_values`` dicts (``None`` when the order
+    did not exist before or does not exist anymore).
+    """
+    deltas = defaultdict(EMPTY_COUNTERS.copy)
+    for values, sign in ((old, -1), (new, 1)):
+        if values is None:
+            continue
+        values = dict(values)
+        vendor_id = values.pop("vendor_id")
+        for field, value in contribution(**values).items():
+            deltas[vendor_id][field] += sign * value
+    return {
+        vendor_id: delta for vendor_id, delta in deltas.items() if any(delta.values())
+    }
+
+
+def apply_vendor_deltas(*delta_maps):
+    """Apply several ``vendor_deltas`` results with one update per vendor."""
+    totals = defaultdict(EMPTY_COUNTERS.copy)
+    for deltas in delta_maps:
+        for vendor_id, delta in deltas.items():
+            for field, value in delta.items():
+                totals[vendor_id][field] += value
+    if settings.VENDOR_METRICS_DEFERRED:
+        DirtyVendor.objects.mark(
+            [vendor_id for vendor_id, delta in totals.items() if any(delta.values())]
+        )
+        return
+    for vendor_id, delta in totals.items():
+        apply_metric_delta(vendor_id, delta)
+
+
+def apply_created_metrics(purchase_orders):
+    apply_vendor_deltas(
+        *(vendor_deltas(new=source_values(po)) for po in purchase_orders)
+    )
+
+
+def apply_acknowledged_metrics(acknowledged, acknowledgment_date):
+    """
+    ``acknowledged`` holds ``(vendor_id, issue_date)`` pairs of purchase orders
+    that were just acknowledged at ``acknowledgment_date`` in bulk.
+    """
+    apply_vendor_deltas(
+        *(
+            {
+                vendor_id: {
+                    "response_time_total": (
+                        acknowledgment_date - issue_date
+                    ).total_seconds(),
+                    "acknowledged_pos": 1,
+                }
+            }
+            for vendor_id, issue_date in acknowledged
+        )
+    )
+
+
+def _ratio(numerator, denominator, scale=1.0):
+    return Case(
+        When(
+            **{f"{denominator}__gt": 0},
+            then=F(numerator) * Value(scale) / F(denominator),
+        ),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def derived_metrics():
+    metrics = {
+        "on_time_delivery_rate": _ratio("on_time_pos", "completed_pos", 100.0),
+        "quality_rating_avg": _ratio("quality_rating_sum", "quality_rating_count"),
+        "average_response_time": _ratio("response_time_total", "acknowledged_pos"),
+        "fulfillment_rate": _ratio("completed_pos", "total_pos", 100.0),
+    }
+    # From the counters too: the columns hold the old metrics in the UPDATE.
+    score = performance_score(metrics, F("acknowledged_pos"))
+    return {**metrics, "performance_score": score}
+
+
+def _python_ratio(numerator, denominator, scale=1.0):
+    return numerator * scale / denominator if denominator else 0.0
+
+
+def metric_values(counters):
+    metrics = {
+        "on_time_delivery_rate": _python_ratio(
+            counters["on_time_pos"], counters["completed_pos"], 100.0
+        ),
+        "quality_rating_avg": _python_ratio(
+            counters["quality_rating_sum"], counters["quality_rating_count"]
+        ),
+        "average_response_time": _python_ratio(
+            counters["response_time_total"], counters["acknowledged_pos"]
+        ),
+        "fulfillment_rate": _python_ratio(
+            counters["completed_pos"], counters["total_pos"], 100.0
+        ),
+    }
+    score = performance_score(metrics, counters["acknowledged_pos"])
+    return {**metrics, "performance_score": score}
+
+
+def metrics_changed(vendor_ids):
+    invalidate_vendor_performance(vendor_ids)
+    record_history_on_commit(vendor_ids)
+
+
+def _update_derived_metrics(vendor_id):
+    Vendor.objects.filter(pk=vendor_id).update(
+        **derived_metrics(), metrics_version=F("metrics_version") + 1
+    )
+    metrics_changed([vendor_id])
+
+
+def apply_metric_delta(vendor_id, delta):
+    """
+    Add ``delta`` to the vendor counters and derive its metrics again. In
+    deferred mode the vendor is only queued for the ``process_vendor_metrics``
+    worker, which recomputes it from scratch.
+    """
+    changes = {field: F(field) + value for field, value in delta.items() if value}
+    if not changes:
+        return
+    if settings.VENDOR_METRICS_DEFERRED:
+        DirtyVendor.objects.mark([vendor_id])
+        return
+    with transaction.atomic():
+        Vendor.objects.filter(pk=vendor_id).update(**changes)
+        _update_derived_metrics(vendor_id)
+
+
+def counter_aggregates():
+    completed = Q(status=COMPLETED)
+    return {
+        "total_pos": Count("id"),
+        "completed_pos": Count("id", filter=completed),
+        "on_time_pos": Count(
+            "id", filter=completed & Q(delivery_date__lte=F("expected_delivery_date"))
+        ),
+        "quality_rating_sum": Sum("quality_rating", filter=completed, default=0.0),
+        "quality_rating_count": Count("quality_rating", filter=completed),
+        "response_time_total": Sum(
+            F("acknowledgment_date") - F("issue_date"),
+            filter=Q(acknowledgment_date__isnull=False),
+        ),
+        "acknowledged_pos": Count("acknowledgment_date"),
+    }
+
+
+def aggregated_counters(row):
+    counters = {field: row.get(field) or 0 for field in COUNTER_FIELDS}
+    if counters["response_time_total"]:
+        counters["response_time_total"] = counters[
+            "response_time_total"
+        ].total_seconds()
+    return counters
+
+
+def update_performance_metrics(vendor):
+    """
+    Rebuild the vendor counters from its purchase orders. The signals keep
+    them up to date incrementally; this is only needed to repair drift.
+    """
+    counters = aggregated_counters(
+        PurchaseOrder.objects.filter(vendor=vendor).aggregate(**counter_aggregates())
+    )
+    with transaction.atomic():
+        Vendor.objects.filter(pk=vendor.pk).update(**counters)
+        _update_derived_metrics(vendor.pk)
+    vendor.refresh_from_db(
+        fields=[
+            *COUNTER_FIELDS,
+            *PERFORMANCE_METRICS,
+            "performance_score",
+            "metrics_version",
+        ]
+    )
+
+
+def recompute_vendor_metrics(vendors, batch_size=500, progress=None):
+    """
+    Rebuild counters and metrics of every vendor in the ``vendors`` queryset
+    from one grouped aggregate over their purchase orders, written back with
+    ``bulk_update`` in batches of ``batch_size``. ``progress`` is called with
+    the number of vendors done after each batch. Returns that number.
+    """
+    rows = (
+        PurchaseOrder.objects.filter(vendor__in=vendors.values("pk"))
+        .values("vendor_id")
+        .annotate(**counter_aggregates())
+        .order_by()
+    )
+    aggregates = {row.pop("vendor_id"): row for row in rows}
+    vendor_ids = list(vendors.order_by("pk").values_list("pk", flat=True))
+    fields = [
+        *COUNTER_FIELDS,
+        *PERFORMANCE_METRICS,
+        "performance_score",
+        "metrics_version",
+    ]
+
+    done = 0
+    for start in range(0, len(vendor_ids), batch_size):
+        batch = []
+        for vendor_id in vendor_ids[start : start + batch_size]:
+            counters = aggregated_counters(aggregates.get(vendor_id, {}))
+            batch.append(
+                Vendor(
+                    pk=vendor_id,
+                    **counters,
+                    **metric_values(counters),
+                    metrics_version=F("metrics_version") + 1,
+                )
+            )
+        with transaction.atomic():
+            Vendor.objects.bulk_update(batch, fields)
+            metrics_changed([vendor.pk for vendor in batch])
+        done += len(batch)
+        if progress:
+            progress(done)
+    return done
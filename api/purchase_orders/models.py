@@ -1,13 +1,15 @@
-from django.db import models
+from django.db import models, transaction
 
+from api.tracking import ChangeTrackingMixin
 from api.vendors.models import Vendor
 
 # Create your models here.
 
 
-class PurchaseOrder(models.Model):
+class PurchaseOrder(ChangeTrackingMixin, models.Model):
     po_number = models.CharField(max_length=100, unique=True)
-    vendor = models.ForeignKey(Vendor, on_delete=models.CASCADE)
+    # Indexed as the leading column of the composite indexes below.
+    vendor = models.ForeignKey(Vendor, on_delete=models.CASCADE, db_index=False)
     order_date = models.DateTimeField()
     expected_delivery_date = models.DateTimeField()
     delivery_date = models.DateTimeField(null=True, blank=True)
@@ -17,3 +19,56 @@ class PurchaseOrder(models.Model):
     quality_rating = models.FloatField(null=True, blank=True)
     issue_date = models.DateTimeField(auto_now_add=True)
     acknowledgment_date = models.DateTimeField(null=True, blank=True)
+
+    def save(self, *args, **kwargs):
+        # Keeps the vendor metric updates (or the deferred queue entry) made by
+        # the post_save signal in the same transaction as the order itself.
+        # No savepoint: a failure inside an outer transaction rolls it back.
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["issue_date", "id"], name="api_po_issue_date_id_idx"),
+            models.Index(fields=["vendor", "status"], name="api_po_vendor_status_idx"),
+            models.Index(
+                fields=["vendor", "acknowledgment_date"], name="api_po_vendor_ack_idx"
+            ),
+            models.Index(
+                fields=["vendor", "issue_date"],
+                condition=models.Q(acknowledgment_date__isnull=True),
+                name="api_po_vendor_unack_idx",
+            ),
+        ]
+
+
+class PurchaseOrderItem(models.Model):
+    """
+    One SKU of ``PurchaseOrder.items``, kept in sync with it. The order's
+    vendor and status are copied so that SKU lookups are index range scans.
+    """
+
+    # Indexed as the leading column of the unique constraint below.
+    purchase_order = models.ForeignKey(
+        PurchaseOrder,
+        on_delete=models.CASCADE,
+        related_name="line_items",
+        db_index=False,
+    )
+    sku = models.CharField(max_length=255)
+    quantity = models.IntegerField()
+    vendor = models.ForeignKey(
+        Vendor, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    status = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["purchase_order", "sku"], name="api_po_item_sku_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["sku", "vendor"], name="api_po_item_sku_vendor_idx"),
+            models.Index(fields=["sku", "status"], name="api_po_item_sku_status_idx"),
+        ]
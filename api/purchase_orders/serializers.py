@@ -1,9 +1,96 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 
-from .models import PurchaseOrder
+from .line_items import create_line_items, parse_items
+from .metrics import apply_created_metrics
+from .models import PurchaseOrder, PurchaseOrderItem
+
+
+class PurchaseOrderListSerializer(serializers.ListSerializer):
+    """
+    Creates purchase orders with a single ``bulk_create``. ``po_number``
+    uniqueness is checked with one query for the whole batch instead of one
+    per item. With ``skip_invalid`` in the context, invalid items are left
+    out and reported in ``skipped`` instead of failing the batch.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        po_number = self.child.fields["po_number"]
+        unique = [v for v in po_number.validators if isinstance(v, UniqueValidator)]
+        po_number.validators = [v for v in po_number.validators if v not in unique]
+        self.unique_message = unique[0].message if unique else None
+        self.skipped = []
+
+    def to_internal_value(self, data):
+        self._taken = set()
+        if not isinstance(data, list):
+            return super().to_internal_value(data)
+        self._taken = set(
+            PurchaseOrder.objects.filter(
+                po_number__in=[
+                    item.get("po_number") for item in data if isinstance(item, dict)
+                ]
+            ).values_list("po_number", flat=True)
+        )
+        if not self.context.get("skip_invalid"):
+            return super().to_internal_value(data)
+        validated = []
+        for index, item in enumerate(data):
+            try:
+                validated.append(self.run_child_validation(item))
+            except serializers.ValidationError as exc:
+                self.skipped.append({"index": index, "errors": exc.detail})
+        return validated
+
+    def run_child_validation(self, data):
+        value = super().run_child_validation(data)
+        if value["po_number"] in self._taken:
+            raise serializers.ValidationError(
+                {"po_number": [self.unique_message]}, code="unique"
+            )
+        self._taken.add(value["po_number"])
+        return value
+
+    def create(self, validated_data):
+        purchase_orders = [PurchaseOrder(**attrs) for attrs in validated_data]
+        with transaction.atomic():
+            PurchaseOrder.objects.bulk_create(purchase_orders)
+            create_line_items(purchase_orders)
+            apply_created_metrics(purchase_orders)
+        return purchase_orders
 
 
 class PurchaseOrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = PurchaseOrder
         fields = "__all__"
+        list_serializer_class = PurchaseOrderListSerializer
+
+    def validate_items(self, value):
+        # The line items store the quantities in an integer column.
+        quantity = PurchaseOrderItem._meta.get_field("quantity")
+        for sku, count in parse_items(value).items():
+            try:
+                quantity.run_validators(count)
+            except DjangoValidationError as exc:
+                raise serializers.ValidationError(
+                    f"Invalid quantity for SKU {sku}: {' '.join(exc.messages)}"
+                )
+        return value
+
+
+class BatchAcknowledgeSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=1000
+    )
+
+
+class SkuQuerySerializer(serializers.Serializer):
+    """Query parameters of the SKU endpoints: the line items they select."""
+
+    sku = serializers.CharField(max_length=255)
+    vendor = serializers.IntegerField(required=False)
+    status = serializers.CharField(max_length=100, required=False)
@@ -1,54 +1,90 @@
-from django.db.models import F
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import PurchaseOrder
+from api.vendors.models import Vendor
+
+from .line_items import LINE_ITEM_FIELDS, create_line_items, sync_line_items
+from .metrics import SOURCE_FIELDS, apply_metric_delta, source_values, vendor_deltas
+from .models import PurchaseOrder, PurchaseOrderItem
+
+
+def _affects_metrics(update_fields):
+    return update_fields is None or any(
+        PurchaseOrder._meta.get_field(field).attname in SOURCE_FIELDS
+        for field in update_fields
+    )
 
 
 @receiver(pre_save, sender=PurchaseOrder)
-def pre_save_purchase_order(sender, instance, **kwargs):
-    if instance.pk:
-        old_po = PurchaseOrder.objects.get(pk=instance.pk)
-        instance._old_status = old_po.status
-    else:
-        instance._old_status = None
+def pre_save_purchase_order(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None or not _affects_metrics(update_fields):
+        return
+    untracked = [field for field in SOURCE_FIELDS if not instance.is_tracked(field)]
+    if untracked:
+        # Only instances that were not loaded from the database (or loaded
+        # with deferred fields) need a query to know their previous state.
+        old_values = (
+            PurchaseOrder.objects.filter(pk=instance.pk).values(*untracked).first()
+        )
+        if old_values is not None:
+            instance._loaded_values = {**instance._loaded_values, **old_values}
 
 
-@receiver(post_save, sender=PurchaseOrder)
-def update_vendor_performance(sender, instance, created, **kwargs):
-    old_status = getattr(instance, "_old_status", None)
-    new_status = instance.status
-    if old_status != new_status and (
-        new_status == "completed" or old_status == "completed"
-    ):
-        if instance.vendor:
-            update_performance_metrics(instance.vendor)
-
-
-def update_performance_metrics(vendor):
-    pos = PurchaseOrder.objects.filter(vendor=vendor)
-    completed_pos = pos.filter(status="completed")
-
-    on_time_deliveries = completed_pos.filter(
-        delivery_date__lte=F("expected_delivery_date")
-    ).count()
-    if completed_pos.count() > 0:
-        vendor.on_time_delivery_rate = on_time_deliveries / completed_pos.count() * 100
-    else:
-        vendor.on_time_delivery_rate = 0
-
-    quality_ratings = [
-        po.quality_rating for po in completed_pos if po.quality_rating is not None
+def _is_saved(field, update_fields):
+    field = PurchaseOrder._meta.get_field(field)
+    return (
+        update_fields is None
+        or field.name in update_fields
+        or field.attname in update_fields
+    )
+
+
+def _saved_changes(instance, fields, update_fields):
+    return [
+        field
+        for field in fields
+        if _is_saved(field, update_fields) and instance.has_changed(field)
     ]
-    if quality_ratings:
-        vendor.quality_rating_avg = sum(quality_ratings) / len(quality_ratings)
-    else:
-        vendor.quality_rating_avg = 0
-
-    successful_fulfillments = pos.filter(status="completed").count()
-    if pos.count() > 0:
-        vendor.fulfillment_rate = successful_fulfillments / pos.count() * 100
-    else:
-        vendor.fulfillment_rate = 0
-
-    vendor.save()
+
+
+@receiver(post_save, sender=PurchaseOrder)
+def update_vendor_performance(sender, instance, created, update_fields=None, **kwargs):
+    if not _affects_metrics(update_fields):
+        return
+    old_values = None
+    new_values = source_values(instance)
+    if not created:
+        if not _saved_changes(instance, SOURCE_FIELDS, update_fields):
+            return
+        if all(instance.is_tracked(field) for field in SOURCE_FIELDS):
+            old_values = {field: instance.previous(field) for field in SOURCE_FIELDS}
+            # Fields left out of update_fields keep their stored value.
+            new_values = {
+                field: value if _is_saved(field, update_fields) else old_values[field]
+                for field, value in new_values.items()
+            }
+    for vendor_id, delta in vendor_deltas(old_values, new_values).items():
+        apply_metric_delta(vendor_id, delta)
+
+
+@receiver(post_save, sender=PurchaseOrder)
+def sync_purchase_order_items(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        create_line_items([instance])
+        return
+    changed = _saved_changes(instance, LINE_ITEM_FIELDS, update_fields)
+    if "items" in changed:
+        sync_line_items([instance])
+    elif changed:
+        PurchaseOrderItem.objects.filter(purchase_order=instance).update(
+            vendor_id=instance.vendor_id, status=instance.status
+        )
+
+
+@receiver(post_delete, sender=PurchaseOrder)
+def remove_vendor_performance(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Vendor):
+        # The vendor is being deleted along with its purchase orders.
+        return
+    for vendor_id, delta in vendor_deltas(old=source_values(instance)).items():
+        apply_metric_delta(vendor_id, delta)
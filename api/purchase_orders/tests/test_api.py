@@ -1,14 +1,28 @@
 import json
 from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet, Sum
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 
-from api.purchase_orders.models import PurchaseOrder
+from api.purchase_orders.metrics import COUNTER_FIELDS, recompute_vendor_metrics
+from api.purchase_orders.models import PurchaseOrder, PurchaseOrderItem
+from api.purchase_orders.views import (
+    AsyncExportPurchaseOrderView,
+    AsyncPurchaseOrderListView,
+    PurchaseOrderViewSet,
+)
 from api.vendors.models import Vendor
 
 
@@ -68,7 +82,66 @@ class PurchaseOrderTestCase(APITestCase):
         url = reverse("purchaseorder-list")
         response = self.client.get(url, {"vendor": self.vendor.id}, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_fast_list_matches_serializer_output(self):
+        PurchaseOrder.objects.create(
+            po_number="PO123457",
+            vendor=self.vendor,
+            order_date="2022-01-02T10:30:00.123456Z",
+            expected_delivery_date="2022-01-10T00:00:00Z",
+            delivery_date="2022-01-09T08:00:00Z",
+            items={"caf\u00e9": [1, 2.5, None], "note": "\u2028"},
+            quantity=3,
+            status="completed",
+            quality_rating=4.5,
+            acknowledgment_date=timezone.now(),
+        )
+        url = reverse("purchaseorder-list")
+        for params in ({}, {"page_size": 1}, {"status": "completed"}):
+            with self.subTest(params=params):
+                fast = self.client.get(url, params)
+                with mock.patch.object(PurchaseOrderViewSet, "fast_list", False):
+                    slow = self.client.get(url, params)
+                self.assertEqual(fast.status_code, status.HTTP_200_OK)
+                self.assertEqual(fast.content, slow.content)
+        next_url = self.client.get(url, {"page_size": 1}).data["next"]
+        fast = self.client.get(next_url)
+        with mock.patch.object(PurchaseOrderViewSet, "fast_list", False):
+            self.assertEqual(fast.content, self.client.get(next_url).content)
+
+    def test_sparse_fieldsets(self):
+        url = reverse("purchaseorder-list")
+        params = {"fields": "id,po_number,status,vendor", "page_size": 1}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(
+            list(response.data["results"][0]), ["id", "po_number", "status", "vendor"]
+        )
+        self.assertNotIn('"items"', queries[-1]["sql"])
+        with mock.patch.object(PurchaseOrderViewSet, "fast_list", False):
+            with CaptureQueriesContext(connection) as queries:
+                slow = self.client.get(url, params)
+        self.assertEqual(response.content, slow.content)
+        self.assertNotIn('"items"', queries[-1]["sql"])
+        self.assertIn("next", response.data)
+
+        url = reverse("purchaseorder-detail", args=[self.purchase_order.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"exclude": "items, order_date"})
+        self.assertNotIn("items", response.data)
+        self.assertNotIn("order_date", response.data)
+        self.assertEqual(response.data["po_number"], "PO123456")
+        self.assertNotIn('"items"', queries[-1]["sql"])
+
+        response = self.client.get(url, {"fields": "po_number,total", "exclude": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {"fields", "exclude"})
+        # Writes are not affected.
+        response = self.client.patch(
+            url + "?fields=id", {"status": "completed"}, format="json"
+        )
+        self.assertEqual(response.data["status"], "completed")
 
     def test_delete_purchase_order(self):
         url = reverse("purchaseorder-detail", args=[self.purchase_order.id])
@@ -88,3 +161,499 @@ class PurchaseOrderTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.vendor.refresh_from_db()
         self.assertTrue(self.vendor.average_response_time > 0)
+
+    def test_status_change_does_not_reload_purchase_order(self):
+        purchase_order = PurchaseOrder.objects.get(id=self.purchase_order.id)
+        self.assertFalse(purchase_order.has_changed("status"))
+        purchase_order.status = "completed"
+        purchase_order.delivery_date = timezone.now()
+        self.assertTrue(purchase_order.has_changed("status"))
+        self.assertEqual(purchase_order.previous("status"), "pending")
+        with CaptureQueriesContext(connection) as queries:
+            purchase_order.save()
+        self.assertFalse(
+            any(query["sql"].startswith("SELECT") for query in queries.captured_queries)
+        )
+        self.assertFalse(purchase_order.has_changed("status"))
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.fulfillment_rate, 100)
+
+    def test_json_snapshot_is_copied_on_first_read(self):
+        PurchaseOrder.objects.filter(pk=self.purchase_order.pk).update(
+            items={"item1": 10}
+        )
+        with mock.patch("api.tracking.copy.deepcopy") as deepcopy:
+            purchase_orders = list(PurchaseOrder.objects.all())
+            self.assertFalse(purchase_orders[0].has_changed("items"))
+        deepcopy.assert_not_called()
+
+        purchase_order = purchase_orders[0]
+        purchase_order.items["item2"] = 5
+        self.assertTrue(purchase_order.has_changed("items"))
+        self.assertEqual(purchase_order.previous("items"), {"item1": 10})
+        purchase_order.save()
+        self.assertFalse(purchase_order.has_changed("items"))
+        self.assertEqual(
+            dict(purchase_order.line_items.values_list("sku", "quantity")),
+            {"item1": 10, "item2": 5},
+        )
+
+    def test_save_without_metric_fields_skips_metrics(self):
+        purchase_order = PurchaseOrder.objects.get(id=self.purchase_order.id)
+        purchase_order.quantity = 35
+        with self.assertNumQueries(1):
+            purchase_order.save(update_fields=["quantity"])
+
+    def test_partial_save_counts_only_saved_fields(self):
+        purchase_order = PurchaseOrder.objects.get(id=self.purchase_order.id)
+        purchase_order.status = "completed"
+        purchase_order.quality_rating = 4.0
+        purchase_order.save(update_fields=["status"])
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.completed_pos, 1)
+        self.assertEqual(self.vendor.quality_rating_count, 0)
+
+        purchase_order.save(update_fields=["quality_rating"])
+        self.vendor.refresh_from_db()
+        live = [getattr(self.vendor, field) for field in COUNTER_FIELDS]
+        recompute_vendor_metrics(Vendor.objects.filter(pk=self.vendor.pk))
+        self.vendor.refresh_from_db()
+        self.assertEqual(
+            live, [getattr(self.vendor, field) for field in COUNTER_FIELDS]
+        )
+        self.assertEqual(self.vendor.quality_rating_sum, 4.0)
+        self.assertEqual(self.vendor.quality_rating_count, 1)
+
+    def test_acknowledge_keeps_running_average_response_time(self):
+        other = PurchaseOrder.objects.create(
+            po_number="PO123458",
+            vendor=self.vendor,
+            order_date="2022-01-01T00:00:00Z",
+            expected_delivery_date="2022-01-10T00:00:00Z",
+            items=json.dumps({"item5": "1"}),
+            quantity=1,
+            status="pending",
+        )
+        PurchaseOrder.objects.filter(pk=self.purchase_order.pk).update(
+            issue_date=timezone.now() - timedelta(hours=1)
+        )
+        PurchaseOrder.objects.filter(pk=other.pk).update(
+            issue_date=timezone.now() - timedelta(hours=3)
+        )
+        for po in (self.purchase_order, other):
+            url = reverse("acknowledge_purchase_order", args=[po.id])
+            self.assertEqual(self.client.post(url).status_code, status.HTTP_200_OK)
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.acknowledged_pos, 2)
+        self.assertAlmostEqual(self.vendor.average_response_time, 7200, delta=10)
+
+        PurchaseOrder.objects.get(pk=other.pk).delete()
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.acknowledged_pos, 1)
+        self.assertAlmostEqual(self.vendor.average_response_time, 3600, delta=10)
+
+    def bulk_payload(self, *po_numbers):
+        return [
+            {
+                "po_number": po_number,
+                "vendor": self.vendor.id,
+                "order_date": "2022-01-02T00:00:00Z",
+                "expected_delivery_date": "2022-01-11T00:00:00Z",
+                "delivery_date": "2022-01-10T00:00:00Z",
+                "items": {"item3": "15"},
+                "quantity": 15,
+                "status": "completed",
+                "quality_rating": 4.0,
+            }
+            for po_number in po_numbers
+        ]
+
+    def test_bulk_create_purchase_orders(self):
+        url = reverse("bulk_create_purchase_orders")
+        response = self.client.post(
+            url, self.bulk_payload("PO2", "PO3", "PO4"), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(PurchaseOrder.objects.count(), 4)
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_pos, 4)
+        self.assertEqual(self.vendor.fulfillment_rate, 75)
+        self.assertEqual(self.vendor.on_time_delivery_rate, 100)
+
+    def test_bulk_create_rejects_whole_batch_on_error(self):
+        url = reverse("bulk_create_purchase_orders")
+        payload = self.bulk_payload("PO2", "PO123456", "PO2")
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("po_number", response.data[1])
+        self.assertIn("po_number", response.data[2])
+        self.assertEqual(PurchaseOrder.objects.count(), 1)
+
+    def test_bulk_create_partial_skips_invalid_items(self):
+        url = reverse("bulk_create_purchase_orders") + "?partial=true"
+        payload = self.bulk_payload("PO2", "PO3")
+        payload[1]["quantity"] = "many"
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["created"]), 1)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertIn("quantity", response.data["errors"][0]["errors"])
+        self.assertEqual(PurchaseOrder.objects.count(), 2)
+
+    def test_out_of_range_item_quantities_are_rejected(self):
+        payload = self.bulk_payload("PO2")[0]
+        payload["items"] = {"item3": 2**70}
+        response = self.client.post(
+            reverse("purchaseorder-list"), payload, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("items", response.data)
+
+        # Repeated SKUs are summed into one line item.
+        payload = self.bulk_payload("PO3")
+        payload[0]["items"] = [{"sku": "item3", "quantity": 2**62}] * 2
+        response = self.client.post(
+            reverse("bulk_create_purchase_orders"), payload, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("items", response.data[0])
+        self.assertEqual(PurchaseOrder.objects.count(), 1)
+
+    def test_batch_acknowledge_purchase_orders(self):
+        self.client.post(
+            reverse("bulk_create_purchase_orders"),
+            self.bulk_payload("PO2", "PO3"),
+            format="json",
+        )
+        PurchaseOrder.objects.update(issue_date=timezone.now() - timedelta(hours=2))
+        already = PurchaseOrder.objects.get(po_number="PO3")
+        already.acknowledgment_date = timezone.now()
+        already.save()
+        ids = list(
+            PurchaseOrder.objects.exclude(pk=already.pk).values_list("pk", flat=True)
+        )
+
+        url = reverse("batch_acknowledge_purchase_orders")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                url, {"ids": [*ids, already.pk, 999]}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["acknowledged"], sorted(ids))
+        self.assertEqual(response.data["already_acknowledged"], [already.pk])
+        self.assertEqual(response.data["not_found"], [999])
+        updates = [
+            query for query in queries.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        self.assertEqual(len(updates), 3)
+        self.assertFalse(
+            PurchaseOrder.objects.filter(acknowledgment_date__isnull=True).exists()
+        )
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.acknowledged_pos, 3)
+        self.assertAlmostEqual(self.vendor.average_response_time, 7200, delta=10)
+
+    def test_batch_acknowledge_skips_concurrently_acknowledged(self):
+        self.client.post(
+            reverse("bulk_create_purchase_orders"),
+            self.bulk_payload("PO2", "PO3"),
+            format="json",
+        )
+        ids = list(PurchaseOrder.objects.values_list("pk", flat=True))
+        raced = ids[0]
+        update = QuerySet.update
+
+        def concurrent_update(queryset, **kwargs):
+            # Another request acknowledges a row after the batch read it.
+            if queryset.model is PurchaseOrder and "acknowledgment_date" in kwargs:
+                update(
+                    PurchaseOrder.objects.filter(pk=raced),
+                    acknowledgment_date=timezone.now() - timedelta(hours=1),
+                )
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(
+            QuerySet, "update", autospec=True, side_effect=concurrent_update
+        ):
+            response = self.client.post(
+                reverse("batch_acknowledge_purchase_orders"),
+                {"ids": ids},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["acknowledged"], sorted(ids[1:]))
+        self.assertEqual(response.data["already_acknowledged"], [raced])
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.acknowledged_pos, 2)
+
+    def test_export_purchase_orders_ndjson(self):
+        url = reverse("export_purchase_orders")
+        response = self.client.get(
+            url, {"vendor": self.vendor.id, "fields": "po_number,status,order_date"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [
+                {
+                    "po_number": "PO123456",
+                    "order_date": "2022-01-01T00:00:00Z",
+                    "status": "pending",
+                }
+            ],
+        )
+
+    def test_export_purchase_orders_csv(self):
+        url = reverse("export_purchase_orders")
+        response = self.client.get(url, {"output": "csv", "status": "completed"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].startswith("id,po_number,vendor,"))
+
+    async def test_async_export_streams_from_async_iterator(self):
+        headers = {"authorization": "Token " + self.token.key}
+        url = reverse("export_purchase_orders")
+        params = {"output": "csv", "fields": "po_number,status"}
+        response = await self.async_client.get(url, params, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIs(
+            response.resolver_match.func.view_class, AsyncExportPurchaseOrderView
+        )
+        self.assertTrue(response.is_async)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(
+            content.decode().splitlines(), ["po_number,status", "PO123456,pending"]
+        )
+
+        response = await self.async_client.get(url, {"output": "xml"}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("output", response.json())
+
+    def test_export_purchase_orders_rejects_invalid_parameters(self):
+        url = reverse("export_purchase_orders")
+        self.assertEqual(
+            self.client.get(url, {"fields": "secret"}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            self.client.get(url, {"order_date__gte": "soon"}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_filter_purchase_orders(self):
+        self.client.post(
+            reverse("bulk_create_purchase_orders"),
+            self.bulk_payload("PO2", "PO3"),
+            format="json",
+        )
+        url = reverse("purchaseorder-list")
+        response = self.client.get(
+            url, {"vendor": self.vendor.id, "status": "completed"}, format="json"
+        )
+        self.assertEqual(
+            sorted(po["po_number"] for po in response.data["results"]), ["PO2", "PO3"]
+        )
+        response = self.client.get(
+            url,
+            {"order_date__gte": "2022-01-02T00:00:00Z", "unknown": "ignored"},
+            format="json",
+        )
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.client.get(url, {"acknowledgment_date__isnull": "false"})
+        self.assertEqual(response.data["results"], [])
+        response = self.client.get(url, {"vendor": "abc"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("vendor", response.data)
+
+    def line_items(self):
+        return set(
+            PurchaseOrderItem.objects.values_list(
+                "purchase_order__po_number", "sku", "quantity", "vendor", "status"
+            )
+        )
+
+    def test_line_items_follow_items(self):
+        # ``items`` sent as a JSON string of a mapping of SKU to quantity.
+        self.assertEqual(
+            self.line_items(),
+            {
+                ("PO123456", "item1", 10, self.vendor.id, "pending"),
+                ("PO123456", "item2", 20, self.vendor.id, "pending"),
+            },
+        )
+        url = reverse("purchaseorder-detail", args=[self.purchase_order.id])
+        self.client.patch(
+            url,
+            {"items": [{"sku": "item1", "quantity": 4}, {"sku": "item3"}]},
+            format="json",
+        )
+        self.assertEqual(
+            self.line_items(), {("PO123456", "item1", 4, self.vendor.id, "pending")}
+        )
+        self.client.patch(url, {"status": "completed"}, format="json")
+        self.assertEqual(
+            self.line_items(), {("PO123456", "item1", 4, self.vendor.id, "completed")}
+        )
+        self.client.post(
+            reverse("bulk_create_purchase_orders"),
+            self.bulk_payload("PO2"),
+            format="json",
+        )
+        self.assertIn(
+            ("PO2", "item3", 15, self.vendor.id, "completed"), self.line_items()
+        )
+        self.client.delete(url)
+        self.assertEqual(
+            self.line_items(), {("PO2", "item3", 15, self.vendor.id, "completed")}
+        )
+
+    def test_backfill_line_items_command(self):
+        self.client.post(
+            reverse("bulk_create_purchase_orders"),
+            self.bulk_payload("PO2", "PO3"),
+            format="json",
+        )
+        expected = self.line_items()
+        PurchaseOrderItem.objects.all().delete()
+        PurchaseOrderItem.objects.create(
+            purchase_order=self.purchase_order,
+            sku="stale",
+            quantity=1,
+            vendor=self.vendor,
+            status="pending",
+        )
+        out = StringIO()
+        call_command("backfill_purchase_order_items", batch_size=2, stdout=out)
+        self.assertIn("Rebuilt the line items of 3 purchase orders", out.getvalue())
+        self.assertEqual(self.line_items(), expected)
+
+    def test_sku_lookup_and_summary(self):
+        other_vendor = Vendor.objects.create(
+            name="Other Vendor",
+            contact_details="other@vendor.com",
+            address="1 Other St",
+            vendor_code="VEND005",
+        )
+        payload = self.bulk_payload("PO2", "PO3", "PO4")
+        payload[2]["vendor"] = other_vendor.id
+        payload[2]["items"] = json.dumps({"item3": 5, "item1": "2"})
+        self.client.post(
+            reverse("bulk_create_purchase_orders"), payload, format="json"
+        )
+
+        url = reverse("sku_purchase_orders")
+        response = self.client.get(url, {"sku": "item1", "status": "pending"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [po["po_number"] for po in response.data["results"]], ["PO123456"]
+        )
+        response = self.client.get(url, {"sku": "item3", "vendor": self.vendor.id})
+        self.assertEqual(
+            sorted(po["po_number"] for po in response.data["results"]), ["PO2", "PO3"]
+        )
+        response = self.client.get(url, {"vendor": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {"sku", "vendor"})
+
+        response = self.client.get(reverse("sku_summary"), {"sku": "item3"})
+        self.assertEqual(
+            response.data,
+            {
+                "sku": "item3",
+                "purchase_orders": 3,
+                "total_quantity": 35,
+                "vendors": [
+                    {
+                        "vendor": self.vendor.id,
+                        "purchase_orders": 2,
+                        "total_quantity": 30,
+                    },
+                    {
+                        "vendor": other_vendor.id,
+                        "purchase_orders": 1,
+                        "total_quantity": 5,
+                    },
+                ],
+            },
+        )
+
+    async def test_async_read_views_match_sync_views(self):
+        headers = {"authorization": "Token " + self.token.key}
+        url = reverse("purchaseorder-list")
+        params = {"vendor": self.vendor.id, "status": "pending"}
+        response = await self.async_client.get(url, params, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIs(
+            response.resolver_match.func.view_class, AsyncPurchaseOrderListView
+        )
+        sync_response = await sync_to_async(self.client.get)(url, params)
+        self.assertEqual(response.content, sync_response.content)
+
+        response = await self.async_client.get(url, {"vendor": "abc"}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("vendor", response.json())
+
+        url = reverse("purchaseorder-detail", args=[self.purchase_order.id])
+        response = await self.async_client.get(url, headers=headers)
+        self.assertEqual(response.json()["po_number"], "PO123456")
+
+        for url, params in (
+            (reverse("purchaseorder-list"), {"fields": "id,status"}),
+            (url, {"exclude": "items"}),
+        ):
+            response = await self.async_client.get(url, params, headers=headers)
+            sync_response = await sync_to_async(self.client.get)(url, params)
+            self.assertEqual(response.content, sync_response.content)
+        response = await self.async_client.get(url, {"fields": "x"}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # Routes without an async view keep working under ASGI.
+        response = await self.async_client.post(
+            reverse("bulk_create_purchase_orders"),
+            self.bulk_payload("PO2"),
+            content_type="application/json",
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class PurchaseOrderQueryPlanTestCase(TestCase):
+    def assertUsesIndex(self, queryset, index):
+        self.assertIn(f"USING INDEX {index}", queryset.explain())
+
+    def test_vendor_access_patterns_use_composite_indexes(self):
+        purchase_orders = PurchaseOrder.objects.filter(vendor_id=1)
+        self.assertUsesIndex(
+            purchase_orders.filter(status="completed"), "api_po_vendor_status_idx"
+        )
+        self.assertUsesIndex(
+            purchase_orders.filter(acknowledgment_date__gte=timezone.now()),
+            "api_po_vendor_ack_idx",
+        )
+        self.assertUsesIndex(
+            purchase_orders.filter(acknowledgment_date__isnull=True).order_by(
+                "issue_date"
+            ),
+            "api_po_vendor_unack_idx",
+        )
+        self.assertUsesIndex(
+            PurchaseOrder.objects.order_by("-issue_date", "-id"),
+            "api_po_issue_date_id_idx",
+        )
+
+    def test_sku_access_patterns_use_line_item_indexes(self):
+        line_items = PurchaseOrderItem.objects.filter(sku="SKU-0001")
+        self.assertUsesIndex(
+            line_items.values("vendor").annotate(Sum("quantity")),
+            "api_po_item_sku_vendor_idx",
+        )
+        self.assertUsesIndex(
+            line_items.filter(status="pending"), "api_po_item_sku_status_idx"
+        )
@@ -1,12 +1,45 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import AcknowledgePurchaseOrderAPIView, PurchaseOrderViewSet
+from .views import (
+    AcknowledgePurchaseOrderAPIView,
+    BatchAcknowledgePurchaseOrderAPIView,
+    BulkCreatePurchaseOrderAPIView,
+    ExportPurchaseOrderAPIView,
+    PurchaseOrderViewSet,
+    SkuPurchaseOrderListView,
+    SkuSummaryAPIView,
+)
 
 router = DefaultRouter()
 router.register(r"", PurchaseOrderViewSet)
 
 urlpatterns = [
+    path(
+        "bulk/",
+        BulkCreatePurchaseOrderAPIView.as_view(),
+        name="bulk_create_purchase_orders",
+    ),
+    path(
+        "acknowledge/",
+        BatchAcknowledgePurchaseOrderAPIView.as_view(),
+        name="batch_acknowledge_purchase_orders",
+    ),
+    path(
+        "export/",
+        ExportPurchaseOrderAPIView.as_view(),
+        name="export_purchase_orders",
+    ),
+    path(
+        "items/",
+        SkuPurchaseOrderListView.as_view(),
+        name="sku_purchase_orders",
+    ),
+    path(
+        "items/summary/",
+        SkuSummaryAPIView.as_view(),
+        name="sku_summary",
+    ),
     path("", include(router.urls)),
     path(
         "<int:po_id>/acknowledge/",
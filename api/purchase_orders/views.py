@@ -1,52 +1,249 @@
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.http import Http404, StreamingHttpResponse
 from django.utils import timezone
-from rest_framework import permissions, status, viewsets
-from rest_framework.authentication import TokenAuthentication
+from rest_framework import generics, permissions, status, viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import PurchaseOrder
-from .serializers import PurchaseOrderSerializer
+from api.async_views import AsyncReadView
+from api.mixins import FastListMixin, SparseFieldsMixin
+from api.pagination import IssueDateCursorPagination
+from api.serializers import (
+    row_serializer,
+    sparse_fields,
+    sparse_queryset,
+    trim_fields,
+)
+from api.users.authentication import CachedTokenAuthentication
 
+from .export import (
+    EXPORT_FORMATS,
+    aexport_chunks,
+    export_chunks,
+    export_fields,
+    export_queryset,
+)
+from .filters import PurchaseOrderFilterBackend
+from .metrics import apply_acknowledged_metrics
+from .models import PurchaseOrder, PurchaseOrderItem
+from .serializers import (
+    BatchAcknowledgeSerializer,
+    PurchaseOrderSerializer,
+    SkuQuerySerializer,
+)
 
-class PurchaseOrderViewSet(viewsets.ModelViewSet):
+
+class PurchaseOrderViewSet(SparseFieldsMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = PurchaseOrder.objects.all()
     serializer_class = PurchaseOrderSerializer
-    authentication_classes = [TokenAuthentication]
+    pagination_class = IssueDateCursorPagination
+    filter_backends = [PurchaseOrderFilterBackend]
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+
+class AsyncPurchaseOrderListView(AsyncReadView):
+    async def get(self, request):
+        queryset = PurchaseOrderFilterBackend().filter_queryset(
+            request, PurchaseOrder.objects.all(), self
+        )
+        paginator = IssueDateCursorPagination()
+        field_names = sparse_fields(PurchaseOrderSerializer, request.query_params)
+        rows = row_serializer(PurchaseOrderSerializer).only(field_names)
+        queryset = rows.values(queryset, paginator.ordering)
+        page = await paginator.apaginate_queryset(queryset, request, self)
+        return paginator.get_paginated_response(rows.many(page))
+
+
+class AsyncPurchaseOrderDetailView(AsyncReadView):
+    async def get(self, request, pk):
+        field_names = sparse_fields(PurchaseOrderSerializer, request.query_params)
+        queryset = sparse_queryset(
+            PurchaseOrder.objects.all(), PurchaseOrderSerializer, field_names
+        )
+        try:
+            purchase_order = await queryset.aget(pk=pk)
+        except (PurchaseOrder.DoesNotExist, TypeError, ValueError):
+            raise Http404("No PurchaseOrder matches the given query.")
+        serializer = PurchaseOrderSerializer(
+            purchase_order, context={"request": request}
+        )
+        return Response(trim_fields(serializer, field_names).data)
+
+
+def sku_line_items(params):
+    query = SkuQuerySerializer(data=params)
+    query.is_valid(raise_exception=True)
+    return PurchaseOrderItem.objects.filter(**query.validated_data)
+
+
+class SkuPurchaseOrderListView(FastListMixin, generics.ListAPIView):
+    """Purchase orders containing a SKU, optionally of a vendor or status."""
+
+    serializer_class = PurchaseOrderSerializer
+    pagination_class = IssueDateCursorPagination
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        line_items = sku_line_items(self.request.query_params)
+        return PurchaseOrder.objects.filter(pk__in=line_items.values("purchase_order"))
+
+
+class SkuSummaryAPIView(APIView):
+    """Ordered quantity and number of purchase orders of a SKU, per vendor."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        vendors = list(
+            sku_line_items(request.query_params)
+            .values("vendor")
+            .annotate(purchase_orders=Count("id"), total_quantity=Sum("quantity"))
+            .order_by("vendor")
+        )
+        return Response(
+            {
+                "sku": request.query_params["sku"],
+                "purchase_orders": sum(row["purchase_orders"] for row in vendors),
+                "total_quantity": sum(row["total_quantity"] for row in vendors),
+                "vendors": vendors,
+            }
+        )
+
+
+class BulkCreatePurchaseOrderAPIView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
+    def post(self, request):
+        skip_invalid = request.query_params.get("partial", "").lower() in ("1", "true")
+        serializer = PurchaseOrderSerializer(
+            data=request.data,
+            many=True,
+            context={"request": request, "skip_invalid": skip_invalid},
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        if not skip_invalid:
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(
+            {"created": serializer.data, "errors": serializer.skipped},
+            status=(
+                status.HTTP_201_CREATED
+                if serializer.instance or not serializer.skipped
+                else status.HTTP_400_BAD_REQUEST
+            ),
+        )
+
 
 class AcknowledgePurchaseOrderAPIView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, po_id):
-        try:
-            purchase_order = PurchaseOrder.objects.get(pk=po_id)
-        except PurchaseOrder.DoesNotExist:
-            return Response(
-                {"error": "Purchase Order not found"}, status=status.HTTP_404_NOT_FOUND
-            )
-
-        purchase_order.acknowledgment_date = timezone.now()
-        purchase_order.save()
+        # The vendor's response time counters are updated with F() expressions
+        # by the post_save signal, inside this transaction.
+        with transaction.atomic():
+            try:
+                purchase_order = PurchaseOrder.objects.select_for_update().get(pk=po_id)
+            except PurchaseOrder.DoesNotExist:
+                return Response(
+                    {"error": "Purchase Order not found"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
 
-        self.update_response_time(purchase_order.vendor)
+            purchase_order.acknowledgment_date = timezone.now()
+            purchase_order.save(update_fields=["acknowledgment_date"])
 
         return Response(
             {"message": "Purchase Order acknowledged successfully"},
             status=status.HTTP_200_OK,
         )
 
-    def update_response_time(self, vendor):
-        pos = PurchaseOrder.objects.filter(
-            vendor=vendor, acknowledgment_date__isnull=False
+
+class BatchAcknowledgePurchaseOrderAPIView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = BatchAcknowledgeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = set(serializer.validated_data["ids"])
+        acknowledgment_date = timezone.now()
+
+        with transaction.atomic():
+            rows = (
+                PurchaseOrder.objects.select_for_update()
+                .filter(pk__in=ids)
+                .values_list("pk", "vendor_id", "issue_date", "acknowledgment_date")
+            )
+            pending = {}
+            already_acknowledged = []
+            for pk, vendor_id, issue_date, acknowledged_at in rows:
+                if acknowledged_at is None:
+                    pending[pk] = (vendor_id, issue_date)
+                else:
+                    already_acknowledged.append(pk)
+            if pending:
+                updated = PurchaseOrder.objects.filter(
+                    pk__in=pending, acknowledgment_date__isnull=True
+                ).update(acknowledgment_date=acknowledgment_date)
+                if updated < len(pending):
+                    # Some were acknowledged concurrently since they were read
+                    # (select_for_update is a no-op on some backends): only
+                    # count the rows this update set.
+                    acknowledged = set(
+                        PurchaseOrder.objects.filter(
+                            pk__in=pending, acknowledgment_date=acknowledgment_date
+                        ).values_list("pk", flat=True)
+                    )
+                    already_acknowledged.extend(pending.keys() - acknowledged)
+                    pending = {pk: pending[pk] for pk in acknowledged}
+                apply_acknowledged_metrics(pending.values(), acknowledgment_date)
+
+        return Response(
+            {
+                "acknowledged": sorted(pending),
+                "already_acknowledged": sorted(already_acknowledged),
+                "not_found": sorted(ids - pending.keys() - set(already_acknowledged)),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+def export_response(params, chunks):
+    """
+    A streaming response with the ``chunks`` (``export_chunks`` or
+    ``aexport_chunks``) of the purchase orders an export request selects.
+    """
+    output = params.get("output", "ndjson")
+    if output not in EXPORT_FORMATS:
+        raise ValidationError(
+            {"output": [f"Must be one of: {', '.join(EXPORT_FORMATS)}."]}
         )
-        response_times = [po.acknowledgment_date - po.issue_date for po in pos]
-        if response_times:
-            total_seconds = sum([rt.total_seconds() for rt in response_times])
-            average_response_time = total_seconds / len(response_times)
-        else:
-            average_response_time = 0
+    fields = export_fields(params.get("fields"))
+    queryset = export_queryset(params, fields)
+    response = StreamingHttpResponse(
+        chunks(queryset, fields, output), content_type=EXPORT_FORMATS[output]
+    )
+    response["Content-Disposition"] = f'attachment; filename="purchase_orders.{output}"'
+    return response
+
+
+class ExportPurchaseOrderAPIView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return export_response(request.query_params, export_chunks)
+
+
+class AsyncExportPurchaseOrderView(AsyncReadView):
+    """The export under ASGI, streamed from an async iterator."""
 
-        vendor.average_response_time = average_response_time
-        vendor.save()
+    async def get(self, request):
+        return export_response(request.query_params, aexport_chunks)
@@ -0,0 +1,62 @@
+import math
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = (
+    orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson is not None else None
+)
+
+
+def _has_non_finite_float(data):
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_non_finite_float(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite_float(value) for value in data)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` producing the same JSON with orjson, which serializes
+    datetimes, UUIDs and nested JSON natively; other types (Decimals, lazy
+    strings...) go through DRF's encoder. The bytes are the same but for
+    floats in exponent notation, written the shortest way (``1e-7`` and
+    ``1e16`` instead of ``1e-07`` and ``1e+16``). Falls back to the stdlib
+    renderer when orjson is not installed, for indented output (the browsable
+    API), for settings orjson can't honour (``UNICODE_JSON``, ``COMPACT_JSON``
+    or ``STRICT_JSON`` off) and for NaN and infinite floats, which orjson
+    would write as ``null`` where ``STRICT_JSON`` rejects them.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default, option=ORJSON_OPTIONS
+            )
+        except TypeError:
+            # e.g. integers over 64 bits.
+            return super().render(data, accepted_media_type, renderer_context)
+        if b"null" in ret and _has_non_finite_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped like JSONRenderer does, to keep the output a JavaScript subset.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
@@ -0,0 +1,196 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+# Same result as the to_representation() of these exact field classes.
+CONVERTERS = {
+    serializers.CharField: str,
+    serializers.IntegerField: int,
+    serializers.FloatField: float,
+}
+
+# Fields whose to_representation() takes the model attribute value as is.
+TO_REPRESENTATION_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.DateField,
+    serializers.DateTimeField,
+    serializers.DecimalField,
+    serializers.DurationField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.TimeField,
+    serializers.UUIDField,
+)
+
+
+class RowSerializer:
+    """
+    Serializes ``values()`` rows like a ``ModelSerializer`` serializes model
+    instances, without building the instances. ``fields`` holds the
+    ``(field_name, column, converter)`` of each readable field.
+    """
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields
+        self.columns = [column for _, column, _ in fields]
+
+    def values(self, queryset, ordering=()):
+        """``queryset.values()`` with the columns needed, and ``ordering``'s."""
+        columns = [*self.columns]
+        for order in ordering:
+            name = order.lstrip("-")
+            if name not in columns:
+                columns.append(name)
+        return queryset.values(*columns)
+
+    def to_representation(self, row):
+        data = {}
+        for field_name, column, converter in self.fields:
+            value = row[column]
+            data[field_name] = None if value is None else converter(value)
+        return data
+
+    def many(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+    def only(self, field_names):
+        """The ``RowSerializer`` of the ``field_names`` fields (all for None)."""
+        if field_names is None:
+            return self
+        return RowSerializer(
+            self.model, [field for field in self.fields if field[0] in field_names]
+        )
+
+
+def _identity(value):
+    return value
+
+
+def _converter(field):
+    field_class = type(field)
+    if field_class in CONVERTERS:
+        return CONVERTERS[field_class]
+    if field_class is serializers.JSONField and not field.binary:
+        return _identity
+    if field_class is serializers.PrimaryKeyRelatedField and field.pk_field is None:
+        # The foreign key column holds the primary key DRF would output.
+        return _identity
+    if isinstance(field, TO_REPRESENTATION_FIELDS) and not isinstance(
+        field, serializers.RelatedField
+    ):
+        return field.to_representation
+    return None
+
+
+@lru_cache(maxsize=None)
+def row_serializer(serializer_class):
+    """
+    The ``RowSerializer`` of a ``ModelSerializer`` class, or None when one of
+    its fields is not a plain model field (nested or method fields, custom
+    sources...).
+    """
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    fields = []
+    for field in serializer._readable_fields:
+        if (
+            isinstance(field, serializers.BaseSerializer)
+            or len(field.source_attrs) != 1
+        ):
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        converter = _converter(field)
+        if converter is None or not model_field.concrete or model_field.many_to_many:
+            return None
+        fields.append((field.field_name, model_field.attname, converter))
+    return RowSerializer(model, fields)
+
+
+@lru_cache(maxsize=None)
+def _readable_sources(serializer_class):
+    """
+    Readable field name -> name of the model field it reads, None when it
+    does not read exactly one concrete model field.
+    """
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    sources = {}
+    for field in serializer._readable_fields:
+        sources[field.field_name] = None
+        if (
+            isinstance(field, serializers.BaseSerializer)
+            or len(field.source_attrs) != 1
+        ):
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        if model_field.concrete and not model_field.many_to_many:
+            sources[field.field_name] = model_field.name
+    return sources
+
+
+def _field_names(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def sparse_fields(serializer_class, params):
+    """
+    Names of the readable fields of ``serializer_class`` selected by the
+    comma separated ``fields`` and ``exclude`` query parameters in ``params``,
+    or None when they select all of them. Unknown names raise a
+    ``ValidationError`` keyed by parameter.
+    """
+    readable = _readable_sources(serializer_class)
+    selected = set(readable)
+    errors = {}
+    for param in ("fields", "exclude"):
+        names = _field_names(params.get(param) or "")
+        if not names:
+            continue
+        unknown = names.difference(readable)
+        if unknown:
+            errors[param] = [f"Unknown fields: {', '.join(sorted(unknown))}."]
+        elif param == "fields":
+            selected &= names
+        else:
+            selected -= names
+    if errors:
+        raise serializers.ValidationError(errors)
+    return None if len(selected) == len(readable) else frozenset(selected)
+
+
+def sparse_queryset(queryset, serializer_class, field_names, ordering=()):
+    """
+    ``queryset`` loading only the columns of the ``field_names`` fields and of
+    ``ordering``, unless a field does not map to a model column.
+    """
+    if field_names is None:
+        return queryset
+    sources = _readable_sources(serializer_class)
+    columns = [sources[name] for name in field_names]
+    if None in columns:
+        return queryset
+    return queryset.only(*columns, *(order.lstrip("-") for order in ordering))
+
+
+def trim_fields(serializer, field_names):
+    """Drop the fields not in ``field_names`` (None keeps them) from the output."""
+    if field_names is None:
+        return serializer
+    if isinstance(serializer, serializers.ListSerializer):
+        fields = serializer.child.fields
+    else:
+        fields = serializer.fields
+    for name in list(fields):
+        if name not in field_names:
+            del fields[name]
+    return serializer
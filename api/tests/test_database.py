@@ -0,0 +1,50 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from django.db import connection
+from django.test import SimpleTestCase
+
+from vms.db_backends.sqlite3.base import DatabaseWrapper
+
+
+class SQLiteBackendTestCase(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = str(Path(directory.name) / "db.sqlite3")
+        self.connection = DatabaseWrapper(
+            {
+                **connection.settings_dict,
+                "NAME": self.path,
+                "TRANSACTION_MODE": "IMMEDIATE",
+                "PRAGMAS": {
+                    "journal_mode": "WAL",
+                    "synchronous": "NORMAL",
+                    "busy_timeout": 1234,
+                },
+            },
+            alias="sqlite-backend-test",
+        )
+        self.addCleanup(self.connection.close)
+
+    def test_pragmas_are_set_on_new_connections(self):
+        with self.connection.cursor() as cursor:
+            for pragma, value in (
+                ("journal_mode", "wal"),
+                ("synchronous", 1),
+                ("busy_timeout", 1234),
+            ):
+                cursor.execute(f"PRAGMA {pragma}")
+                self.assertEqual(cursor.fetchone()[0], value)
+
+    def test_transactions_take_the_write_lock_when_they_begin(self):
+        self.connection.set_autocommit(
+            False, force_begin_transaction_with_broken_autocommit=True
+        )
+        other = sqlite3.connect(self.path, timeout=0)
+        self.addCleanup(other.close)
+        with self.assertRaisesMessage(sqlite3.OperationalError, "locked"):
+            other.execute("BEGIN IMMEDIATE")
+        self.connection.rollback()
+        self.connection.set_autocommit(True)
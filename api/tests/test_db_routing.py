@@ -0,0 +1,59 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from api.management.commands.sync_replica import backup_sqlite
+from api.vendors.models import Vendor
+from vms.db_backends.sqlite3.base import DatabaseWrapper
+from vms.db_routers import PrimaryReplicaRouter, request_routing, use_primary
+
+
+@override_settings(REPLICA_DATABASE="replica")
+class PrimaryReplicaRouterTestCase(SimpleTestCase):
+    router = PrimaryReplicaRouter()
+
+    def test_reads_outside_requests_use_the_primary(self):
+        self.assertEqual(self.router.db_for_read(Vendor), "default")
+
+    def test_reads_use_the_primary_after_a_write(self):
+        with request_routing():
+            self.assertEqual(self.router.db_for_read(Vendor), "replica")
+            with use_primary():
+                self.assertEqual(self.router.db_for_read(Vendor), "default")
+            self.assertEqual(self.router.db_for_read(Vendor), "replica")
+            self.assertEqual(self.router.db_for_write(Vendor), "default")
+            self.assertEqual(self.router.db_for_read(Vendor), "default")
+
+    def test_reads_of_unsafe_requests_and_transactions_use_the_primary(self):
+        with request_routing(pinned=True):
+            self.assertEqual(self.router.db_for_read(Vendor), "default")
+        with request_routing(), mock.patch.object(connection, "in_atomic_block", True):
+            self.assertEqual(self.router.db_for_read(Vendor), "default")
+
+    @override_settings(REPLICA_DATABASE=None)
+    def test_reads_use_the_primary_without_replica(self):
+        with request_routing():
+            self.assertEqual(self.router.db_for_read(Vendor), "default")
+
+
+class SyncReplicaTestCase(SimpleTestCase):
+    def test_backup_sqlite(self):
+        with tempfile.TemporaryDirectory() as directory:
+            primary = DatabaseWrapper(
+                {**connection.settings_dict, "NAME": str(Path(directory) / "primary")},
+                alias="primary",
+            )
+            with primary.cursor() as cursor:
+                cursor.execute("CREATE TABLE vendor (code TEXT)")
+                cursor.execute("INSERT INTO vendor VALUES ('V1')")
+            path = str(Path(directory) / "replica")
+            backup_sqlite(primary, path)
+            primary.close()
+            replica = sqlite3.connect(path)
+            rows = replica.execute("SELECT code FROM vendor").fetchall()
+            replica.close()
+        self.assertEqual(rows, [("V1",)])
@@ -0,0 +1,83 @@
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from api.instrumentation import request_metrics
+from api.renderers import FastJSONRenderer
+from api.vendors.models import Vendor
+
+
+class RequestInstrumentationTestCase(APITestCase):
+    def setUp(self):
+        request_metrics.reset()
+        self.user = User.objects.create_user(username="user", password="pass")
+        self.token, _ = Token.objects.get_or_create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
+        self.vendor = Vendor.objects.create(
+            name="Vendor", contact_details="-", address="-", vendor_code="V1"
+        )
+
+    def server_timing(self, response):
+        return dict(
+            metric.strip().split(";", 1)
+            for metric in response["Server-Timing"].split(",")
+        )
+
+    def test_server_timing_and_metrics(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("vendor-list"))
+        timing = self.server_timing(response)
+        self.assertEqual(set(timing), {"db", "view", "render", "total"})
+        self.assertIn('desc="2 queries"', timing["db"])
+
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = response.content.decode()
+        self.assertIn("# TYPE vms_request_duration_seconds histogram", metrics)
+        labels = 'method="GET",route="vendor-list",status="200"'
+        self.assertIn(f"vms_request_duration_seconds_count{{{labels}}} 1", metrics)
+        self.assertIn(f'vms_request_db_seconds_bucket{{{labels},le="+Inf"}} 1', metrics)
+        self.assertIn(f"vms_request_queries_total{{{labels}}} 2", metrics)
+
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(REQUEST_INSTRUMENTATION={"SLOW_REQUEST_MS": 0})
+    def test_slow_requests_are_logged_with_their_queries(self):
+        url = reverse("vendor-detail", args=[self.vendor.id])
+        with self.assertLogs("api.middleware", "WARNING") as logs:
+            self.client.get(url)
+        self.assertIn(f"Slow request: GET {url} (200)", logs.output[0])
+        self.assertIn('FROM "api_vendor"', logs.output[0])
+
+    async def test_async_views_queries_are_recorded(self):
+        # The token and the vendors, run in a thread by the async ORM.
+        response = await self.async_client.get(
+            reverse("vendor-list"), headers={"authorization": "Token " + self.token.key}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('desc="2 queries"', self.server_timing(response)["db"])
+
+    async def test_async_views_render_time(self):
+        render = FastJSONRenderer.render
+
+        def slow_render(*args, **kwargs):
+            time.sleep(0.01)
+            return render(*args, **kwargs)
+
+        with mock.patch.object(
+            FastJSONRenderer, "render", autospec=True, side_effect=slow_render
+        ):
+            response = await self.async_client.get(
+                reverse("vendor-list"),
+                headers={"authorization": "Token " + self.token.key},
+            )
+        timing = self.server_timing(response)
+        self.assertGreaterEqual(float(timing["render"].split(";")[0][4:]), 10)
+        self.assertIn('desc="view and serialization"', timing["view"])
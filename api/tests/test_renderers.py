@@ -0,0 +1,95 @@
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.benchmarks.renderers import compare_renderers, purchase_order_page
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+    def assertRendersLikeJSONRenderer(self, data, **kwargs):
+        self.assertEqual(
+            FastJSONRenderer().render(data, **kwargs),
+            JSONRenderer().render(data, **kwargs),
+        )
+
+    def test_same_output_as_json_renderer(self):
+        self.assertRendersLikeJSONRenderer(purchase_order_page(50))
+        self.assertRendersLikeJSONRenderer(
+            {
+                "utc": datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.UTC),
+                "paris": datetime.datetime(
+                    2024, 5, 1, 12, 30, 0, 1500, tzinfo=ZoneInfo("Europe/Paris")
+                ),
+                "naive": datetime.datetime(2024, 5, 1, 12, 30),
+                "date": datetime.date(2024, 5, 1),
+                "decimal": Decimal("12.50"),
+                "uuid": uuid.UUID(int=1),
+                "lazy": gettext_lazy("Not found."),
+                "error": [ErrorDetail("This field is required.", code="required")],
+                "separators": "line\u2028paragraph\u2029é",
+                1: {"items": {"SKU-1": 2, "nested": [1.5, None, True]}},
+            }
+        )
+        self.assertRendersLikeJSONRenderer(
+            {"results": [1]}, accepted_media_type="application/json; indent=4"
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_exponent_floats(self):
+        data = {"small": 1e-7, "large": 1e16, "negative": -2.5e-10}
+        fast = FastJSONRenderer().render(data)
+        self.assertEqual(fast, b'{"small":1e-7,"large":1e16,"negative":-2.5e-10}')
+        self.assertEqual(
+            JSONRenderer().render(data),
+            b'{"small":1e-07,"large":1e+16,"negative":-2.5e-10}',
+        )
+        self.assertEqual(json.loads(fast), json.loads(JSONRenderer().render(data)))
+
+    def test_non_finite_floats(self):
+        for value in (float("nan"), float("inf"), float("-inf")):
+            data = {"results": [{"quality_rating": value, "delivery_date": None}]}
+            with self.assertRaisesMessage(ValueError, "not JSON compliant"):
+                FastJSONRenderer().render(data)
+
+        class LenientRenderer(FastJSONRenderer):
+            strict = False
+
+        self.assertEqual(
+            LenientRenderer().render({"rating": float("nan")}), b'{"rating":NaN}'
+        )
+
+    def test_compare_renderers(self):
+        results = compare_renderers(purchase_order_page(10), iterations=2)
+        self.assertEqual(set(results), {"stdlib", "fast"})
+        self.assertEqual(results["stdlib"]["bytes"], results["fast"]["bytes"])
+
+
+class FastJSONParserTestCase(SimpleTestCase):
+    def parse(self, content, **parser_context):
+        return FastJSONParser().parse(io.BytesIO(content), None, parser_context)
+
+    def test_parse(self):
+        content = '{"items": {"SKU-1": 2}, "name": "é", "rating": 4.5}'.encode()
+        self.assertEqual(
+            self.parse(content), JSONParser().parse(io.BytesIO(content), None, {})
+        )
+        self.assertEqual(
+            self.parse('{"name": "é"}'.encode("latin-1"), encoding="latin-1"),
+            {"name": "é"},
+        )
+
+    def test_invalid_json(self):
+        for content in (b'{"items": ', b'{"rating": NaN}'):
+            with self.assertRaisesMessage(ParseError, "JSON parse error"):
+                self.parse(content)
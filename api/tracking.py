@@ -0,0 +1,116 @@
+import copy
+
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+from django.db.models.signals import class_prepared
+from django.dispatch import receiver
+
+
+def _copy(value):
+    # JSON values are the only mutable ones a model field loads.
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+class CopyOnReadAttribute(DeferredAttribute):
+    """
+    Attribute of a JSON field of a ``ChangeTrackingMixin`` model. The value
+    loaded from the database is shared with the snapshot until it is first
+    read, which hands out a copy: instances whose JSON is never read don't
+    pay for copying it, and in-place changes still leave the snapshot alone.
+    """
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        attname = self.field.attname
+        shared = instance.__dict__.get("_shared_values")
+        if shared and attname in shared:
+            shared.discard(attname)
+            instance.__dict__[attname] = copy.deepcopy(instance.__dict__[attname])
+        return super().__get__(instance, cls)
+
+    def __set__(self, instance, value):
+        shared = instance.__dict__.get("_shared_values")
+        if shared:
+            shared.discard(self.field.attname)
+        instance.__dict__[self.field.attname] = value
+
+
+class ChangeTrackingMixin:
+    """
+    Remember the field values an instance was loaded with, so that changes
+    can be detected on save without reading the row again.
+    """
+
+    _loaded_values = {}
+    # Attnames whose loaded value is still the snapshot's (see CopyOnReadAttribute).
+    _shared_values = frozenset()
+    _copy_on_read = frozenset()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        instance._shared_values = {
+            name for name in field_names if name in cls._copy_on_read
+        }
+        return instance
+
+    def _snapshot(self, attnames):
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            **self._loaded_values,
+            **{
+                attname: _copy(getattr(self, attname))
+                for attname in attnames
+                if attname not in deferred
+            },
+        }
+
+    def is_tracked(self, field):
+        return self._meta.get_field(field).attname in self._loaded_values
+
+    def previous(self, field):
+        """Value ``field`` had when the instance was loaded or last saved."""
+        return self._loaded_values.get(self._meta.get_field(field).attname)
+
+    def has_changed(self, field):
+        if self._state.adding:
+            return True
+        attname = self._meta.get_field(field).attname
+        if attname not in self._loaded_values:
+            return attname not in self.get_deferred_fields()
+        if attname in self._shared_values:
+            return False
+        return getattr(self, attname) != self._loaded_values[attname]
+
+    def save(self, *args, update_fields=None, **kwargs):
+        super().save(*args, update_fields=update_fields, **kwargs)
+        fields = self._meta.concrete_fields
+        if update_fields is not None:
+            fields = [
+                field
+                for field in fields
+                if field.name in update_fields or field.attname in update_fields
+            ]
+        self._snapshot(field.attname for field in fields)
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        if fields is None:
+            fields = [field.attname for field in self._meta.concrete_fields]
+        self._snapshot(self._meta.get_field(field).attname for field in fields)
+
+
+@receiver(class_prepared)
+def copy_json_on_read(sender, **kwargs):
+    if not issubclass(sender, ChangeTrackingMixin):
+        return
+    fields = [
+        field
+        for field in sender._meta.concrete_fields
+        if isinstance(field, models.JSONField)
+    ]
+    for field in fields:
+        setattr(sender, field.attname, CopyOnReadAttribute(field))
+    sender._copy_on_read = frozenset(field.attname for field in fields)
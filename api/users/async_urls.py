@@ -0,0 +1,15 @@
+from django.urls import path
+
+from . import urls
+from .views import AsyncCreateUserView, CreateUserView
+
+# Same routes as ``urls``, with the registration hashing passwords off the
+# event loop.
+urlpatterns = [
+    path(
+        "register/",
+        AsyncCreateUserView.as_view(sync_view=CreateUserView.as_view()),
+        name="register",
+    ),
+    *urls.urlpatterns,
+]
@@ -0,0 +1,183 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import checks
+from django.core.cache import InvalidCacheBackendError, caches
+from django.db import transaction
+from rest_framework.authentication import TokenAuthentication
+
+from vms.db_routers import use_primary
+
+DEFAULT_TOKEN_AUTH_CACHE = {"ALIAS": "default", "TIMEOUT": 300, "MAX_ENTRIES": 1024}
+
+
+def token_auth_cache_settings():
+    return {**DEFAULT_TOKEN_AUTH_CACHE, **getattr(settings, "TOKEN_AUTH_CACHE", {})}
+
+
+class LRUCache:
+    """
+    Small thread-safe in-process cache with a TTL and a bounded number of
+    entries, evicting the least recently used one. Values are pickled like
+    in Django's cache backends so callers never share mutable objects.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+        return pickle.loads(value)
+
+    def set(self, key, value, timeout):
+        entry = (time.monotonic() + timeout, pickle.dumps(value))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # Never blocks for long, so the async variants need no thread.
+
+    async def aget(self, key, default=None):
+        return self.get(key, default)
+
+    async def aset(self, key, value, timeout):
+        self.set(key, value, timeout)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_local_cache = LRUCache(DEFAULT_TOKEN_AUTH_CACHE["MAX_ENTRIES"])
+
+
+def token_cache():
+    """
+    The Django cache configured by ``TOKEN_AUTH_CACHE["ALIAS"]``, or the
+    in-process LRU cache when no such cache is configured.
+    """
+    config = token_auth_cache_settings()
+    if config["ALIAS"]:
+        try:
+            return caches[config["ALIAS"]]
+        except InvalidCacheBackendError:
+            pass
+    _local_cache.max_entries = config["MAX_ENTRIES"]
+    return _local_cache
+
+
+# Cache backends whose entries are only seen by the process that set them.
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def check_token_cache(app_configs, **kwargs):
+    """
+    Deployment check (``manage.py check --deploy``) that token revocations
+    reach every worker, i.e. that the token cache is shared between them.
+    """
+    cache = token_cache()
+    backend = f"{type(cache).__module__}.{type(cache).__qualname__}"
+    if cache is not _local_cache and backend not in PROCESS_LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        checks.Warning(
+            "The token authentication cache is local to each process: a "
+            "revoked token is still accepted by the other workers for up to "
+            'TOKEN_AUTH_CACHE["TIMEOUT"] seconds.',
+            hint='Point TOKEN_AUTH_CACHE["ALIAS"] to a shared cache (e.g. '
+            "Redis or Memcached), or run a single worker.",
+            id="api.W001",
+        )
+    ]
+
+
+def token_cache_key(key):
+    # Hashed so that token keys never show up in the cache store.
+    return "auth-token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_tokens(keys, using=None):
+    """
+    Drop the cached credentials of the token ``keys`` once the current
+    transaction commits, so that no request can cache them again in between.
+    """
+    cache_keys = [token_cache_key(key) for key in keys]
+    transaction.on_commit(lambda: token_cache().delete_many(cache_keys), using)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``TokenAuthentication`` that caches the ``(user, token)`` pair of valid
+    tokens for ``TOKEN_AUTH_CACHE["TIMEOUT"]`` seconds. Entries are dropped by
+    the signals in ``api.users.signals`` as soon as a change to the token or
+    its user commits. That only reaches the other workers through a shared
+    cache (e.g. Redis or Memcached): with a per-process cache (the local memory
+    backend or the in-process fallback) a revoked token is accepted by the
+    other workers until their entry expires, see ``check_token_cache``.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = token_cache()
+        cache_key = token_cache_key(key)
+        credentials = cache.get(cache_key)
+        if credentials is None:
+            # From the primary: a stale replica would accept, and cache, a
+            # token revoked in the meantime.
+            with use_primary():
+                credentials = super().authenticate_credentials(key)
+            cache.set(cache_key, credentials, token_auth_cache_settings()["TIMEOUT"])
+        return credentials
+
+    async def aauthenticate(self, request):
+        """
+        ``authenticate`` for the async views: the header is parsed by DRF's
+        ``TokenAuthentication``, and a cache hit needs no thread.
+        """
+        parser = _TokenKeyAuthentication()
+        parser.keyword = self.keyword
+        key = parser.authenticate(request)
+        if key is None:
+            return None
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        credentials = await token_cache().aget(token_cache_key(key))
+        if credentials is None:
+            credentials = await sync_to_async(self.authenticate_credentials)(key)
+        return credentials
+
+
+class _TokenKeyAuthentication(TokenAuthentication):
+    """``authenticate`` returns the token key of the request, unchecked."""
+
+    def authenticate_credentials(self, key):
+        return key
@@ -0,0 +1,38 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+DEFAULT_PASSWORD_HASHING = {"MAX_WORKERS": 2}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def hashing_executor():
+    """
+    The process wide pool hashing passwords for async views. Its size bounds
+    the CPU a burst of sign-ups can take; the other requests keep the event
+    loop and the remaining cores.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            config = {
+                **DEFAULT_PASSWORD_HASHING,
+                **getattr(settings, "PASSWORD_HASHING", {}),
+            }
+            _executor = ThreadPoolExecutor(
+                max_workers=config["MAX_WORKERS"],
+                thread_name_prefix="password-hashing",
+            )
+        return _executor
+
+
+async def amake_password(password):
+    """``make_password`` run in the hashing pool."""
+    return await asyncio.get_running_loop().run_in_executor(
+        hashing_executor(), make_password, password
+    )
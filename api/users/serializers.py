@@ -1,21 +1,30 @@
 from django.contrib.auth.models import User
+from django.db import transaction
 from rest_framework import serializers
 
 
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
+    token = serializers.CharField(source="auth_token.key", read_only=True)
 
     class Meta:
         model = User
-        fields = ("username", "password", "email", "first_name", "last_name")
+        fields = ("username", "password", "email", "first_name", "last_name", "token")
 
     def create(self, validated_data):
-        user = User.objects.create_user(
-            username=validated_data["username"],
-            email=validated_data["email"],
-            first_name=validated_data.get("first_name", ""),
-            last_name=validated_data.get("last_name", ""),
-        )
-        user.set_password(validated_data["password"])
-        user.save()
+        """
+        Insert the user with its password already hashed, and its token (by
+        the ``create_auth_token`` signal) in the same transaction. The async
+        view hashes the password beforehand and passes it as ``password_hash``.
+        """
+        password = validated_data.pop("password")
+        password_hash = validated_data.pop("password_hash", None)
+        user = User(**validated_data)
+        user.clean()
+        if password_hash is None:
+            user.set_password(password)
+        else:
+            user.password = password_hash
+        with transaction.atomic():
+            user.save()
         return user
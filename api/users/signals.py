@@ -1,10 +1,29 @@
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from rest_framework.authtoken.models import Token
 
+from .authentication import invalidate_tokens
+
 
 @receiver(post_save, sender=User)
 def create_auth_token(sender, instance=None, created=False, **kwargs):
     if created:
         Token.objects.create(user=instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, created=False, using=None, **kwargs):
+    if not created:
+        invalidate_tokens(
+            Token.objects.using(using)
+            .filter(user=instance)
+            .values_list("key", flat=True),
+            using,
+        )
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token(sender, instance, using=None, **kwargs):
+    invalidate_tokens([instance.key], using)
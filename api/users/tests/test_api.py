@@ -0,0 +1,196 @@
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from api.users.authentication import (
+    _local_cache,
+    check_token_cache,
+    token_cache,
+    token_cache_key,
+)
+from api.users.views import AsyncCreateUserView
+from api.vendors.models import Vendor
+
+
+class CachedTokenAuthenticationTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user", password="pass")
+        self.token = Token.objects.get(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
+        self.vendor = Vendor.objects.create(
+            name="Vendor", contact_details="", address="", vendor_code="VEND100"
+        )
+        self.url = reverse("vendor-detail", args=[self.vendor.id])
+
+    def test_token_lookup_is_cached(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_deleted_token_is_rejected_immediately(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected_immediately(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tokens_are_invalidated_on_commit(self):
+        self.client.get(self.url)
+        cache_key = token_cache_key(self.token.key)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.token.delete()
+        # Still cached until the deletion commits, so that no request can
+        # cache the token again from the data before it.
+        self.assertIsNotNone(token_cache().get(cache_key))
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(token_cache().get(cache_key))
+
+    def test_process_local_token_cache_deploy_warning(self):
+        self.assertEqual(
+            [warning.id for warning in check_token_cache(None)], ["api.W001"]
+        )
+        shared = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "shared": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": "/tmp/vms-token-cache",
+            },
+        }
+        with override_settings(CACHES=shared, TOKEN_AUTH_CACHE={"ALIAS": "shared"}):
+            self.assertEqual(check_token_cache(None), [])
+
+    async def test_async_authentication_matches_sync(self):
+        self.client.credentials()
+        for header in (
+            None,
+            "Token",
+            "Token a b",
+            "Token unknown",
+            "Bearer " + self.token.key,
+            "Token " + self.token.key,
+        ):
+            with self.subTest(header=header):
+                headers = {} if header is None else {"authorization": header}
+                response = await self.async_client.get(self.url, headers=headers)
+                sync_response = await sync_to_async(self.client.get)(
+                    self.url, headers=headers
+                )
+                self.assertEqual(response.status_code, sync_response.status_code)
+                self.assertEqual(response.json(), sync_response.json())
+                self.assertEqual(
+                    response.get("WWW-Authenticate"),
+                    sync_response.get("WWW-Authenticate"),
+                )
+
+    @contextmanager
+    def stale_replica(self):
+        """A replica of the database holding its data as of now."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "replica")
+            # Not a backup: it waits for the test transaction to end.
+            replica = sqlite3.connect(path)
+            replica.executescript("\n".join(connection.connection.iterdump()))
+            replica.close()
+            connections.settings["replica"] = {**connection.settings_dict, "NAME": path}
+            try:
+                with override_settings(REPLICA_DATABASE="replica"):
+                    yield
+            finally:
+                connections["replica"].close()
+                delattr(connections._connections, "replica")
+                del connections.settings["replica"]
+
+    def get_with_replica(self, url):
+        # Reads in a transaction use the primary, and tests run in one.
+        with mock.patch.object(connection, "in_atomic_block", False):
+            return self.client.get(url)
+
+    def test_token_revoked_while_the_replica_is_stale(self):
+        with self.stale_replica():
+            response = self.get_with_replica(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.token.delete()
+            response = self.get_with_replica(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(TOKEN_AUTH_CACHE={"ALIAS": None, "MAX_ENTRIES": 1})
+    def test_local_lru_fallback(self):
+        self.assertIs(token_cache(), _local_cache)
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        other = User.objects.create_user(username="other", password="pass")
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + other.auth_token.key)
+        self.client.get(self.url)
+        self.assertEqual(len(_local_cache._entries), 1)
+
+
+class RegistrationTestCase(APITestCase):
+    payload = {
+        "username": "new",
+        "password": "s3cret-pass",
+        "email": "New@EXAMPLE.com",
+        "first_name": "New",
+    }
+
+    def test_register_returns_token(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("register"), self.payload)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(username="new")
+        self.assertEqual(response.data["token"], user.auth_token.key)
+        self.assertNotIn("password", response.data)
+        self.assertTrue(user.check_password("s3cret-pass"))
+        self.assertEqual(user.email, "New@example.com")
+        # The user and its token, and no update.
+        statements = [query["sql"].split()[0] for query in queries]
+        self.assertEqual(statements.count("INSERT"), 2)
+        self.assertNotIn("UPDATE", statements)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + response.data["token"])
+        response = self.client.get(reverse("vendor-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    async def test_async_register(self):
+        url = reverse("register")
+        response = await self.async_client.post(
+            url, self.payload, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIs(response.resolver_match.func.view_class, AsyncCreateUserView)
+        user = await User.objects.select_related("auth_token").aget(username="new")
+        self.assertEqual(response.json()["token"], user.auth_token.key)
+        self.assertTrue(await sync_to_async(user.check_password)("s3cret-pass"))
+
+        response = await self.async_client.post(
+            url, self.payload, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("username", response.json())
+        response = await self.async_client.post(
+            url, "{", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,10 +1,30 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
 from rest_framework.authentication import TokenAuthentication
+from rest_framework.response import Response
 
+from api.async_views import AsyncAPIView
+
+from .hashing import amake_password
 from .serializers import UserSerializer
 
 
 class CreateUserView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
+
+
+class AsyncCreateUserView(AsyncAPIView):
+    """Registration under ASGI, hashing the password in the hashing pool."""
+
+    async_methods = ("POST",)
+    authentication_class = None
+
+    async def post(self, request):
+        serializer = UserSerializer(data=request.data)
+        # The username uniqueness check queries the database.
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        password_hash = await amake_password(serializer.validated_data["password"])
+        await sync_to_async(serializer.save)(password_hash=password_hash)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,34 @@
+from django.urls import path, re_path
+
+from . import urls
+from .views import (
+    AsyncVendorDetailView,
+    AsyncVendorListView,
+    AsyncVendorPerformanceView,
+    VendorPerformanceView,
+)
+
+# Same routes as ``urls``, with async views for the reads; the other methods
+# and routes are still served by the sync views. The plain routes come before
+# their format suffix variants, hence ``reversed``.
+sync_views = {pattern.name: pattern.callback for pattern in reversed(urls.router.urls)}
+
+urlpatterns = [
+    *urls.collection_urlpatterns,
+    re_path(
+        r"^$",
+        AsyncVendorListView.as_view(sync_view=sync_views["vendor-list"]),
+        name="vendor-list",
+    ),
+    re_path(
+        r"^(?P<pk>[^/.]+)/$",
+        AsyncVendorDetailView.as_view(sync_view=sync_views["vendor-detail"]),
+        name="vendor-detail",
+    ),
+    path(
+        "<int:vendor_id>/performance/",
+        AsyncVendorPerformanceView.as_view(sync_view=VendorPerformanceView.as_view()),
+        name="vendor-performance",
+    ),
+    *urls.urlpatterns,
+]
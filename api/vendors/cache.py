@@ -0,0 +1,99 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+DEFAULT_VENDOR_PERFORMANCE_CACHE = {"ALIAS": "default", "TIMEOUT": 3600}
+
+
+def performance_cache():
+    config = {
+        **DEFAULT_VENDOR_PERFORMANCE_CACHE,
+        **getattr(settings, "VENDOR_PERFORMANCE_CACHE", {}),
+    }
+    return caches[config["ALIAS"]], config["TIMEOUT"]
+
+
+def performance_cache_key(vendor_id):
+    return f"vendor-performance:{vendor_id}"
+
+
+def performance_generation_key(vendor_id):
+    return f"vendor-performance-generation:{vendor_id}"
+
+
+def _new_generation():
+    return uuid.uuid4().hex
+
+
+# A payload is cached with the generation of the vendor's entry when it was
+# read, which every invalidation replaces. So a payload read before the
+# metrics changed but stored after their invalidation is never served.
+
+
+def _cached_entry(values, vendor_id, generation):
+    entry = values.get(performance_cache_key(vendor_id))
+    if entry is not None and entry[0] == generation:
+        return entry[1]
+    return None
+
+
+def get_cached_performance(vendor_id):
+    """
+    ``(cached, generation)``: the cached value of a vendor's performance, None
+    if there is none for the current generation, and the generation to store
+    a value read from now on with (``set_cached_performance``).
+    """
+    cache, _ = performance_cache()
+    generation_key = performance_generation_key(vendor_id)
+    values = cache.get_many([performance_cache_key(vendor_id), generation_key])
+    generation = values.get(generation_key)
+    if generation is None:
+        generation = _new_generation()
+        cache.add(generation_key, generation, None)
+    return _cached_entry(values, vendor_id, generation), generation
+
+
+def set_cached_performance(vendor_id, generation, cached):
+    cache, timeout = performance_cache()
+    cache.set(performance_cache_key(vendor_id), (generation, cached), timeout)
+
+
+async def aget_cached_performance(vendor_id):
+    cache, _ = performance_cache()
+    generation_key = performance_generation_key(vendor_id)
+    values = await cache.aget_many([performance_cache_key(vendor_id), generation_key])
+    generation = values.get(generation_key)
+    if generation is None:
+        generation = _new_generation()
+        await cache.aadd(generation_key, generation, None)
+    return _cached_entry(values, vendor_id, generation), generation
+
+
+async def aset_cached_performance(vendor_id, generation, cached):
+    cache, timeout = performance_cache()
+    await cache.aset(performance_cache_key(vendor_id), (generation, cached), timeout)
+
+
+def invalidate_vendor_performance(vendor_ids):
+    """
+    Start a new cache generation for the vendors once the current transaction
+    commits, so that no request can cache the old values again in between.
+    """
+    vendor_ids = list(vendor_ids)
+
+    def invalidate():
+        cache, _ = performance_cache()
+        cache.set_many(
+            {
+                performance_generation_key(vendor_id): _new_generation()
+                for vendor_id in vendor_ids
+            },
+            None,
+        )
+        cache.delete_many(
+            [performance_cache_key(vendor_id) for vendor_id in vendor_ids]
+        )
+
+    transaction.on_commit(invalidate)
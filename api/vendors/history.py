@@ -0,0 +1,206 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, FloatField, PositiveBigIntegerField, Value, When
+from django.utils import timezone
+
+from .models import (
+    PERFORMANCE_METRICS,
+    DailyPerformanceRollup,
+    HistoricalPerformance,
+    MonthlyPerformanceRollup,
+    Vendor,
+)
+
+# Vendors folded into the rollups per UPDATE statement.
+ROLLUP_BATCH_SIZE = 100
+
+# Days the samples and the daily rollups are kept (None: forever). The monthly
+# rollups are always kept.
+DEFAULT_VENDOR_PERFORMANCE_HISTORY = {
+    "SAMPLE_RETENTION_DAYS": 90,
+    "DAILY_ROLLUP_RETENTION_DAYS": 730,
+}
+
+
+def history_settings():
+    return {
+        **DEFAULT_VENDOR_PERFORMANCE_HISTORY,
+        **getattr(settings, "VENDOR_PERFORMANCE_HISTORY", {}),
+    }
+
+
+def day_start(moment):
+    return timezone.localtime(moment).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def month_start(moment):
+    return day_start(moment).replace(day=1)
+
+
+ROLLUPS = {
+    "day": (DailyPerformanceRollup, day_start),
+    "month": (MonthlyPerformanceRollup, month_start),
+}
+
+
+def _per_vendor(values, field="vendor_id", output_field=None):
+    if len(values) == 1:
+        return Value(next(iter(values.values())))
+    return Case(
+        *(
+            When(**{field: vendor_id}, then=Value(value))
+            for vendor_id, value in values.items()
+        ),
+        output_field=output_field or FloatField(),
+    )
+
+
+def _add_to_rollups(model, bucket_start, metrics_by_vendor):
+    rollups = model.objects.filter(
+        bucket_start=bucket_start, vendor_id__in=metrics_by_vendor
+    )
+    changes = {"samples": F("samples") + 1}
+    for metric in PERFORMANCE_METRICS:
+        values = _per_vendor(
+            {
+                vendor_id: metrics[metric]
+                for vendor_id, metrics in metrics_by_vendor.items()
+            }
+        )
+        changes[metric] = values
+        changes[f"{metric}_sum"] = F(f"{metric}_sum") + values
+    if rollups.update(**changes) == len(metrics_by_vendor):
+        return
+
+    existing = set(rollups.values_list("vendor_id", flat=True))
+    missing = [
+        model(
+            vendor_id=vendor_id,
+            bucket_start=bucket_start,
+            samples=1,
+            **metrics,
+            **{f"{metric}_sum": value for metric, value in metrics.items()},
+        )
+        for vendor_id, metrics in metrics_by_vendor.items()
+        if vendor_id not in existing
+    ]
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create(missing)
+    except IntegrityError:
+        # Another transaction created some of these buckets in the meantime.
+        _add_to_rollups(
+            model,
+            bucket_start,
+            {
+                rollup.vendor_id: metrics_by_vendor[rollup.vendor_id]
+                for rollup in missing
+            },
+        )
+
+
+def record_performance(metrics_by_vendor, recorded_at=None):
+    """
+    Append a ``HistoricalPerformance`` sample for every vendor in
+    ``metrics_by_vendor`` (vendor id -> performance metric values) and fold
+    it into the daily and monthly rollups.
+    """
+    if not metrics_by_vendor:
+        return
+    recorded_at = recorded_at or timezone.now()
+    HistoricalPerformance.objects.bulk_create(
+        HistoricalPerformance(vendor_id=vendor_id, date=recorded_at, **metrics)
+        for vendor_id, metrics in metrics_by_vendor.items()
+    )
+    vendor_ids = list(metrics_by_vendor)
+    for model, bucket in ROLLUPS.values():
+        for start in range(0, len(vendor_ids), ROLLUP_BATCH_SIZE):
+            _add_to_rollups(
+                model,
+                bucket(recorded_at),
+                {
+                    vendor_id: metrics_by_vendor[vendor_id]
+                    for vendor_id in vendor_ids[start : start + ROLLUP_BATCH_SIZE]
+                },
+            )
+
+
+def record_vendor_history(vendors=None, recorded_at=None, batch_size=500):
+    """
+    Record a performance sample (``record_performance``) of the ``vendors``
+    (all of them by default) whose metrics changed since their last one, in
+    batches of ``batch_size``. Returns the number of vendors sampled.
+
+    Metric updates call it for their vendors once they commit
+    (``record_history_on_commit``); the ``record_vendor_history`` command
+    catches up on the vendors a failed or skipped recording left behind.
+    """
+    if vendors is None:
+        vendors = Vendor.objects.all()
+    recorded_at = recorded_at or timezone.now()
+    changed = (
+        vendors.exclude(history_version=F("metrics_version"))
+        .order_by("pk")
+        .values_list("pk", "metrics_version", *PERFORMANCE_METRICS)
+    )
+    done = 0
+    last_pk = None
+    while True:
+        batch = changed if last_pk is None else changed.filter(pk__gt=last_pk)
+        batch = list(batch[:batch_size])
+        if not batch:
+            return done
+        with transaction.atomic():
+            record_performance(
+                {
+                    vendor_id: dict(zip(PERFORMANCE_METRICS, metrics))
+                    for vendor_id, _, *metrics in batch
+                },
+                recorded_at,
+            )
+            # The version sampled: a vendor changed since is sampled next time.
+            Vendor.objects.filter(pk__in=[row[0] for row in batch]).update(
+                history_version=_per_vendor(
+                    {vendor_id: version for vendor_id, version, *_ in batch},
+                    "pk",
+                    PositiveBigIntegerField(),
+                )
+            )
+        done += len(batch)
+        if len(batch) < batch_size:
+            return done
+        last_pk = batch[-1][0]
+
+
+def record_history_on_commit(vendor_ids):
+    """
+    Sample the vendors once the current transaction commits, outside of it so
+    that the vendor rows are not locked for longer. A failure is logged and
+    left to the ``record_vendor_history`` command.
+    """
+    vendor_ids = list(vendor_ids)
+    transaction.on_commit(
+        lambda: record_vendor_history(Vendor.objects.filter(pk__in=vendor_ids)),
+        robust=True,
+    )
+
+
+def prune_history(now=None):
+    """
+    Delete the samples and daily rollups older than their retention
+    (``VENDOR_PERFORMANCE_HISTORY`` setting). Returns the number of rows
+    deleted.
+    """
+    now = now or timezone.now()
+    config = history_settings()
+    deleted = 0
+    for model, field, days in (
+        (HistoricalPerformance, "date", config["SAMPLE_RETENTION_DAYS"]),
+        (DailyPerformanceRollup, "bucket_start", config["DAILY_ROLLUP_RETENTION_DAYS"]),
+    ):
+        if days is not None:
+            cutoff = now - timedelta(days=days)
+            deleted += model.objects.filter(**{f"{field}__lt": cutoff}).delete()[0]
+    return deleted
@@ -0,0 +1,178 @@
+import csv
+import json
+import time
+
+from django.db import transaction
+from rest_framework import serializers
+
+from .models import Vendor
+from .serializers import VendorImportSerializer
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Fields of the vendors already there that an import overwrites.
+UPDATE_FIELDS = ("name", "contact_details", "address")
+
+# Errors kept in the report; the others are only counted.
+DEFAULT_MAX_ERRORS = 1000
+
+
+def import_format(name, default="csv"):
+    """The import format of a file name, from its extension."""
+    extension = name.rsplit(".", 1)[-1].lower() if "." in name else ""
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    if extension == "csv":
+        return "csv"
+    return default
+
+
+class ImportQuerySerializer(serializers.Serializer):
+    input = serializers.ChoiceField(choices=IMPORT_FORMATS, required=False)
+    start_line = serializers.IntegerField(min_value=1, default=1)
+
+
+def _csv_rows(lines):
+    reader = csv.DictReader(lines)
+    for row in reader:
+        # The line the row ends on: quoted values can span several lines.
+        yield reader.line_num, row
+
+
+def _jsonl_rows(lines):
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as exc:
+            yield line_number, serializers.ValidationError(
+                {"non_field_errors": [f"Invalid JSON: {exc}"]}
+            )
+
+
+ROW_READERS = {"csv": _csv_rows, "jsonl": _jsonl_rows}
+
+
+class ImportReport:
+    def __init__(self, max_errors=DEFAULT_MAX_ERRORS):
+        self.max_errors = max_errors
+        self.started = time.perf_counter()
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors = []
+        # Last line of the rows written, to resume from the next one.
+        self.last_line = 0
+
+    def error(self, line_number, detail):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line_number, "errors": detail})
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "last_line": self.last_line,
+            "seconds": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def upsert_vendors(vendors):
+    """
+    Insert the ``vendors`` (unique ``vendor_code``s) or update the vendors
+    with their codes, in one statement. Returns the number of new vendors.
+    """
+    codes = [vendor.vendor_code for vendor in vendors]
+    existing = Vendor.objects.filter(vendor_code__in=codes).count()
+    Vendor.objects.bulk_create(
+        vendors,
+        update_conflicts=True,
+        unique_fields=["vendor_code"],
+        update_fields=UPDATE_FIELDS,
+    )
+    return len(vendors) - existing
+
+
+def import_vendors(
+    lines,
+    input_format="csv",
+    start_line=1,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    max_errors=DEFAULT_MAX_ERRORS,
+    progress=None,
+):
+    """
+    Upsert on ``vendor_code`` the vendors read from ``lines``, an iterable of
+    text lines in ``input_format`` (CSV with a header line, or one JSON object
+    per line), ``chunk_size`` rows per transaction so that memory stays flat
+    whatever the input size. Rows ending before ``start_line`` are skipped, to
+    resume an interrupted import after the ``last_line`` it reported. Rows are
+    validated with ``VendorImportSerializer``; invalid ones are reported with
+    their line number and skipped. ``progress`` is called with the
+    ``ImportReport`` after each chunk, which is also returned.
+
+    Input that cannot be read at all (bad encoding, malformed CSV) raises a
+    ``ValidationError`` with the line it was found on, after writing the rows
+    before it.
+    """
+    report = ImportReport(max_errors)
+    serializer = VendorImportSerializer()
+    # vendor_code -> Vendor: the last row of a code wins within a chunk.
+    pending = {}
+    pending_rows = 0
+    line_number = 0
+
+    def flush():
+        nonlocal pending_rows
+        if pending:
+            with transaction.atomic():
+                created = upsert_vendors(list(pending.values()))
+            report.created += created
+            report.updated += pending_rows - created
+            pending.clear()
+        pending_rows = 0
+        report.last_line = line_number
+        if progress:
+            progress(report)
+
+    try:
+        for line_number, row in ROW_READERS[input_format](lines):
+            if line_number < start_line:
+                continue
+            report.rows += 1
+            try:
+                if isinstance(row, serializers.ValidationError):
+                    raise row
+                attrs = serializer.run_validation(row)
+            except serializers.ValidationError as exc:
+                report.error(line_number, exc.detail)
+            else:
+                pending[attrs["vendor_code"]] = Vendor(**attrs)
+                pending_rows += 1
+            if report.rows % chunk_size == 0:
+                flush()
+    except (csv.Error, UnicodeDecodeError) as exc:
+        flush()
+        raise serializers.ValidationError(
+            {"file": [f"Unreadable input after line {line_number}: {exc}"]}
+        )
+    flush()
+    return report
@@ -1,7 +1,16 @@
 from django.db import models
+from django.db.models import Min
+from django.utils import timezone
 
 # Create your models here.
 
+PERFORMANCE_METRICS = (
+    "on_time_delivery_rate",
+    "quality_rating_avg",
+    "average_response_time",
+    "fulfillment_rate",
+)
+
 
 class Vendor(models.Model):
     name = models.CharField(max_length=255)
@@ -12,3 +21,125 @@ class Vendor(models.Model):
     quality_rating_avg = models.FloatField(default=0.0)
     average_response_time = models.FloatField(default=0.0)
     fulfillment_rate = models.FloatField(default=0.0)
+
+    # Running counters the performance metrics are derived from, maintained
+    # by the purchase order signals.
+    total_pos = models.PositiveIntegerField(default=0, editable=False)
+    completed_pos = models.PositiveIntegerField(default=0, editable=False)
+    on_time_pos = models.PositiveIntegerField(default=0, editable=False)
+    quality_rating_sum = models.FloatField(default=0.0, editable=False)
+    quality_rating_count = models.PositiveIntegerField(default=0, editable=False)
+    response_time_total = models.FloatField(default=0.0, editable=False)
+    acknowledged_pos = models.PositiveIntegerField(default=0, editable=False)
+
+    # Bumped on every change of the performance metrics.
+    metrics_version = models.PositiveBigIntegerField(default=0, editable=False)
+    # metrics_version of the last HistoricalPerformance sample of the vendor.
+    history_version = models.PositiveBigIntegerField(default=0, editable=False)
+
+    # Weighted score of the performance metrics (api.vendors.scoring), stored
+    # along with them for the leaderboard.
+    performance_score = models.FloatField(default=0.0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-performance_score", "id"], name="api_vendor_score_idx"
+            ),
+        ]
+
+
+class HistoricalPerformance(models.Model):
+    vendor = models.ForeignKey(
+        Vendor, on_delete=models.CASCADE, related_name="performance_history"
+    )
+    date = models.DateTimeField()
+    on_time_delivery_rate = models.FloatField()
+    quality_rating_avg = models.FloatField()
+    average_response_time = models.FloatField()
+    fulfillment_rate = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["vendor", "date"], name="api_history_vendor_date_idx"),
+        ]
+
+
+class PerformanceRollup(models.Model):
+    """
+    Aggregate of the ``HistoricalPerformance`` samples of one vendor over a
+    bucket: the number of samples, the sum of each metric (for averages) and
+    its last value.
+    """
+
+    vendor = models.ForeignKey(Vendor, on_delete=models.CASCADE, db_index=False)
+    bucket_start = models.DateTimeField()
+    samples = models.PositiveIntegerField(default=0)
+    on_time_delivery_rate = models.FloatField(default=0.0)
+    quality_rating_avg = models.FloatField(default=0.0)
+    average_response_time = models.FloatField(default=0.0)
+    fulfillment_rate = models.FloatField(default=0.0)
+    on_time_delivery_rate_sum = models.FloatField(default=0.0)
+    quality_rating_avg_sum = models.FloatField(default=0.0)
+    average_response_time_sum = models.FloatField(default=0.0)
+    fulfillment_rate_sum = models.FloatField(default=0.0)
+
+    class Meta:
+        abstract = True
+
+
+class DailyPerformanceRollup(PerformanceRollup):
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["vendor", "bucket_start"], name="api_daily_rollup_bucket_uniq"
+            ),
+        ]
+
+
+class MonthlyPerformanceRollup(PerformanceRollup):
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["vendor", "bucket_start"],
+                name="api_monthly_rollup_bucket_uniq",
+            ),
+        ]
+
+
+class DirtyVendorQuerySet(models.QuerySet):
+    def mark(self, vendor_ids):
+        """
+        Queue the vendors for a metrics recompute. A vendor is queued at most
+        once; marking it again only moves ``last_marked_at`` forward.
+        """
+        now = timezone.now()
+        self.bulk_create(
+            [
+                DirtyVendor(vendor_id=vendor_id, marked_at=now, last_marked_at=now)
+                for vendor_id in vendor_ids
+            ],
+            update_conflicts=True,
+            unique_fields=["vendor"],
+            update_fields=["last_marked_at"],
+        )
+
+    def lag(self):
+        """Seconds since the oldest queued vendor was marked."""
+        oldest = self.aggregate(oldest=Min("marked_at"))["oldest"]
+        return (timezone.now() - oldest).total_seconds() if oldest else 0.0
+
+
+class DirtyVendor(models.Model):
+    """Vendors whose metrics must be recomputed by the deferred worker."""
+
+    vendor = models.OneToOneField(Vendor, on_delete=models.CASCADE, primary_key=True)
+    marked_at = models.DateTimeField()
+    last_marked_at = models.DateTimeField()
+
+    objects = DirtyVendorQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["marked_at"], name="api_dirty_vendor_marked_idx"),
+        ]
@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.lookups import GreaterThan
+
+from .models import PERFORMANCE_METRICS, Vendor
+
+DEFAULT_VENDOR_SCORE = {
+    # Relative weights of the metrics in the score; they need not sum to 1.
+    "WEIGHTS": {
+        "on_time_delivery_rate": 0.35,
+        "quality_rating_avg": 0.35,
+        "average_response_time": 0.1,
+        "fulfillment_rate": 0.2,
+    },
+    # Average response time, in seconds, scoring half of a zero one.
+    "RESPONSE_TIME_SCALE": 86400,
+}
+
+
+def score_settings():
+    return {**DEFAULT_VENDOR_SCORE, **getattr(settings, "VENDOR_SCORE", {})}
+
+
+def performance_score(metrics, acknowledged_pos):
+    """
+    Weighted average, from 0 to 100, of the performance metrics normalized to
+    0..1: the rates out of 100, the quality rating out of 5 and the response
+    time as ``scale / (scale + time)``, or 0 without acknowledged purchase
+    orders (``acknowledged_pos``), like the other metrics of a new vendor.
+    ``metrics`` and ``acknowledged_pos`` are numbers or query expressions,
+    which gives a number or an expression.
+    """
+    config = score_settings()
+    weights = {metric: weight for metric, weight in config["WEIGHTS"].items() if weight}
+    total = sum(weights.values())
+    if not total:
+        return 0.0
+    scale = float(config["RESPONSE_TIME_SCALE"])
+    response_time = scale / (metrics["average_response_time"] + scale)
+    if isinstance(acknowledged_pos, (int, float)):
+        response_time = response_time if acknowledged_pos else 0.0
+    else:
+        response_time = Case(
+            When(GreaterThan(acknowledged_pos, 0), then=response_time),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    normalized = {
+        "on_time_delivery_rate": metrics["on_time_delivery_rate"] / 100.0,
+        "quality_rating_avg": metrics["quality_rating_avg"] / 5.0,
+        "average_response_time": response_time,
+        "fulfillment_rate": metrics["fulfillment_rate"] / 100.0,
+    }
+    score = 0.0
+    for metric, weight in weights.items():
+        score = score + normalized[metric] * (100.0 * weight / total)
+    return score
+
+
+def rescore_vendors(vendors=None, batch_size=1000, progress=None):
+    """
+    Recompute the stored score of the ``vendors`` (all of them by default)
+    from their stored metrics, e.g. after a weight change, with one UPDATE per
+    batch of ``batch_size`` vendors. ``progress`` is called with the number
+    of vendors done after each batch. Returns that number.
+    """
+    if vendors is None:
+        vendors = Vendor.objects.all()
+    vendor_ids = list(vendors.order_by("pk").values_list("pk", flat=True))
+    score = performance_score(
+        {metric: F(metric) for metric in PERFORMANCE_METRICS}, F("acknowledged_pos")
+    )
+    done = 0
+    for start in range(0, len(vendor_ids), batch_size):
+        batch = vendor_ids[start : start + batch_size]
+        Vendor.objects.filter(pk__in=batch).update(performance_score=score)
+        done += len(batch)
+        if progress:
+            progress(done)
+    return done
@@ -1,12 +1,39 @@
 from rest_framework import serializers
 
-from .models import Vendor
+from .models import PERFORMANCE_METRICS, Vendor
 
 
 class VendorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Vendor
-        fields = "__all__"
+        # The counters, metrics_version and performance_score are internal.
+        fields = [
+            "id",
+            "name",
+            "contact_details",
+            "address",
+            "vendor_code",
+            *PERFORMANCE_METRICS,
+        ]
+        read_only_fields = PERFORMANCE_METRICS
+
+    def update(self, instance, validated_data):
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        # Only the columns sent: the counters and metrics are updated
+        # concurrently with F() expressions.
+        instance.save(update_fields=list(validated_data))
+        return instance
+
+
+class VendorImportSerializer(VendorSerializer):
+    """
+    ``VendorSerializer`` without the ``vendor_code`` uniqueness check, which
+    would cost a query per row: imports update the vendors already there.
+    """
+
+    class Meta(VendorSerializer.Meta):
+        extra_kwargs = {"vendor_code": {"validators": []}}
 
 
 class VendorPerformanceSerializer(serializers.ModelSerializer):
@@ -18,3 +45,36 @@ class VendorPerformanceSerializer(serializers.ModelSerializer):
             "average_response_time",
             "fulfillment_rate",
         ]
+
+
+class LeaderboardQuerySerializer(serializers.Serializer):
+    k = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    # Vendors with fewer purchase orders are left out.
+    min_pos = serializers.IntegerField(min_value=0, default=1)
+
+
+class LeaderboardSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Vendor
+        fields = [
+            "id",
+            "name",
+            "vendor_code",
+            "performance_score",
+            *PERFORMANCE_METRICS,
+            "total_pos",
+        ]
+
+
+class PerformanceRollupSerializer(serializers.Serializer):
+    bucket_start = serializers.DateTimeField()
+    samples = serializers.IntegerField()
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for metric in PERFORMANCE_METRICS:
+            data[metric] = getattr(instance, metric)
+            data[f"{metric}_avg"] = (
+                getattr(instance, f"{metric}_sum") / instance.samples
+            )
+        return data
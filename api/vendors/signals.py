@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .cache import invalidate_vendor_performance
+from .models import Vendor
+
+
+@receiver(post_delete, sender=Vendor)
+def invalidate_deleted_vendor_performance(sender, instance, **kwargs):
+    invalidate_vendor_performance([instance.pk])
@@ -1,15 +1,37 @@
 import json
+import os
+import tempfile
 from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 
+from api.purchase_orders.metrics import update_performance_metrics
 from api.purchase_orders.models import PurchaseOrder
-from api.vendors.models import Vendor
+from api.vendors.cache import invalidate_vendor_performance, set_cached_performance
+from api.vendors.history import prune_history, record_vendor_history
+from api.vendors.models import (
+    DailyPerformanceRollup,
+    DirtyVendor,
+    HistoricalPerformance,
+    MonthlyPerformanceRollup,
+    Vendor,
+)
+from api.vendors.serializers import VendorSerializer
+from api.vendors.views import AsyncVendorListView, VendorViewSet
 
 
 class VendorTestCase(APITestCase):
@@ -64,11 +86,208 @@ class VendorTestCase(APITestCase):
             Vendor.objects.get(id=self.vendor1.id).name, "Vendor One Updated"
         )
 
+    def test_vendor_fields(self):
+        response = self.client.get(reverse("vendor-detail", args=[self.vendor1.id]))
+        self.assertEqual(
+            list(response.data),
+            [
+                "id",
+                "name",
+                "contact_details",
+                "address",
+                "vendor_code",
+                "on_time_delivery_rate",
+                "quality_rating_avg",
+                "average_response_time",
+                "fulfillment_rate",
+            ],
+        )
+
+    def test_update_keeps_concurrent_counter_changes(self):
+        vendor = Vendor.objects.get(pk=self.vendor1.pk)
+        Vendor.objects.filter(pk=vendor.pk).update(total_pos=5, fulfillment_rate=40)
+        serializer = VendorSerializer(vendor, data={"name": "Renamed"}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        vendor.refresh_from_db()
+        self.assertEqual(vendor.name, "Renamed")
+        self.assertEqual(vendor.total_pos, 5)
+        self.assertEqual(vendor.fulfillment_rate, 40)
+
     def test_list_vendors(self):
         url = reverse("vendor-list")
         response = self.client.get(url, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)  # Assuming only two vendors exist
+        self.assertEqual(
+            len(response.data["results"]), 2
+        )  # Assuming only two vendors exist
+
+    def test_list_vendors_cursor_pagination(self):
+        url = reverse("vendor-list")
+        response = self.client.get(url, {"page_size": 1}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [vendor["id"] for vendor in response.data["results"]], [self.vendor1.id]
+        )
+        self.assertIsNone(response.data["previous"])
+        self.assertNotIn("offset", response.data["next"])
+
+        response = self.client.get(response.data["next"], format="json")
+        self.assertEqual(
+            [vendor["id"] for vendor in response.data["results"]], [self.vendor2.id]
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_fast_list_matches_serializer_output(self):
+        Vendor.objects.filter(pk=self.vendor2.pk).update(
+            name="Fournisseur \u00e9\u2028",
+            on_time_delivery_rate=0.1 + 0.2,
+            average_response_time=1e-7,
+            total_pos=3,
+        )
+        url = reverse("vendor-list")
+        for params in ({}, {"page_size": 1}):
+            with self.subTest(params=params):
+                fast = self.client.get(url, params)
+                with mock.patch.object(VendorViewSet, "fast_list", False):
+                    slow = self.client.get(url, params)
+                self.assertEqual(fast.status_code, status.HTTP_200_OK)
+                self.assertEqual(fast.content, slow.content)
+
+    def test_sparse_fieldsets(self):
+        url = reverse("vendor-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"exclude": "contact_details,address"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        vendor = response.data["results"][0]
+        self.assertNotIn("address", vendor)
+        self.assertIn("vendor_code", vendor)
+        self.assertNotIn('"address"', queries[-1]["sql"])
+
+        url = reverse("vendor-detail", args=[self.vendor1.id])
+        response = self.client.get(url, {"fields": "id,name"})
+        self.assertEqual(response.data, {"id": self.vendor1.id, "name": "Vendor One"})
+        response = self.client.get(url, {"fields": "nope"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_vendors_command(self):
+        rows = [
+            "name,contact_details,address,vendor_code",
+            "Vendor One Renamed,one@vendor.com,100 One St,VEND001",
+            "Vendor Three,three@vendor.com,300 Three St,VEND003",
+            ',,"no name",VEND004',
+            'Vendor Four,four@vendor.com,"400 Four St,\nSuite 1",VEND004',
+            "Vendor Three Again,three@vendor.com,300 Three St,VEND003",
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write("\n".join(rows) + "\n")
+        self.addCleanup(os.remove, file.name)
+
+        out, err = StringIO(), StringIO()
+        call_command("import_vendors", file.name, chunk_size=2, stdout=out, stderr=err)
+        self.assertIn("Imported 5 rows", out.getvalue())
+        self.assertIn("2 created, 2 updated, 1 failed", out.getvalue())
+        self.assertIn("Line 4: ", err.getvalue())
+        self.assertIn("name", err.getvalue())
+        self.assertEqual(
+            dict(Vendor.objects.values_list("vendor_code", "name")),
+            {
+                "VEND001": "Vendor One Renamed",
+                "VEND002": "Vendor Two",
+                "VEND003": "Vendor Three Again",
+                "VEND004": "Vendor Four",
+            },
+        )
+        self.assertEqual(
+            Vendor.objects.get(vendor_code="VEND004").address, "400 Four St,\nSuite 1"
+        )
+
+        # Resumed after the multi-line row, which ends on line 6.
+        Vendor.objects.filter(vendor_code="VEND003").update(name="Reset")
+        out = StringIO()
+        call_command("import_vendors", file.name, start_line=7, stdout=out)
+        self.assertIn("Imported 1 rows", out.getvalue())
+        self.assertEqual(
+            Vendor.objects.get(vendor_code="VEND003").name, "Vendor Three Again"
+        )
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)
+    def test_import_vendors_upload(self):
+        content = "\n".join(
+            [
+                json.dumps(
+                    {
+                        "name": "Uploaded",
+                        "contact_details": "up@vendor.com",
+                        "address": "1 Upload St",
+                        "vendor_code": "VEND002",
+                    }
+                ),
+                "",
+                "{not json",
+                json.dumps({"name": "No code", "contact_details": "", "address": ""}),
+            ]
+        )
+        url = reverse("vendor-import")
+        response = self.client.post(
+            url,
+            {"file": SimpleUploadedFile("vendors.jsonl", content.encode())},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {
+                key: response.data[key]
+                for key in ("rows", "created", "updated", "failed")
+            },
+            {"rows": 3, "created": 0, "updated": 1, "failed": 2},
+        )
+        self.assertEqual([error["line"] for error in response.data["errors"]], [3, 4])
+        self.assertIn(
+            "Invalid JSON", response.data["errors"][0]["errors"]["non_field_errors"][0]
+        )
+        self.assertIn("vendor_code", response.data["errors"][1]["errors"])
+        self.assertEqual(response.data["last_line"], 4)
+        self.assertEqual(Vendor.objects.get(vendor_code="VEND002").name, "Uploaded")
+
+        response = self.client.post(url, {}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("file", response.data)
+        response = self.client.post(url + "?input=xml", {}, format="multipart")
+        self.assertIn("input", response.data)
+
+    async def test_async_read_views(self):
+        headers = {"authorization": "Token " + self.token.key}
+        url = reverse("vendor-list")
+        response = await self.async_client.get(url, {"page_size": 1}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIs(response.resolver_match.func.view_class, AsyncVendorListView)
+        data = response.json()
+        self.assertEqual(
+            [vendor["id"] for vendor in data["results"]], [self.vendor1.id]
+        )
+        response = await self.async_client.get(data["next"], headers=headers)
+        self.assertEqual(
+            [vendor["id"] for vendor in response.json()["results"]], [self.vendor2.id]
+        )
+
+        url = reverse("vendor-detail", args=[self.vendor1.id])
+        response = await self.async_client.get(url, headers=headers)
+        self.assertEqual(response.json()["name"], "Vendor One")
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+        response = await self.async_client.get(
+            reverse("vendor-detail", args=[0]), headers=headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        # Writes are handed to the sync view.
+        response = await self.async_client.patch(
+            url, {"name": "Renamed"}, content_type="application/json", headers=headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "Renamed")
 
     def test_delete_vendor(self):
         url = reverse("vendor-detail", args=[self.vendor2.id])
@@ -79,6 +298,9 @@ class VendorTestCase(APITestCase):
 
 class VendorPerformanceTestCase(APITestCase):
     def setUp(self):
+        # Cached payloads are only invalidated on commit, which never happens
+        # inside test transactions.
+        cache.clear()
         self.user = User.objects.create_user(username="user", password="pass")
         self.token, _ = Token.objects.get_or_create(user=self.user)
         self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
@@ -131,3 +353,282 @@ class VendorPerformanceTestCase(APITestCase):
         self.assertEqual(
             response.data["quality_rating_avg"], expected_quality_rating_avg
         )
+
+    def test_metrics_follow_purchase_order_changes(self):
+        PurchaseOrder.objects.create(
+            po_number="PO10003",
+            vendor=self.vendor,
+            order_date=self.po1.order_date,
+            expected_delivery_date=self.po1.expected_delivery_date,
+            items=json.dumps({"item5": "1"}),
+            quantity=1,
+            status="pending",
+        )
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_pos, 3)
+        self.assertAlmostEqual(self.vendor.fulfillment_rate, 2 / 3 * 100)
+
+        self.po2.status = "cancelled"
+        self.po2.save()
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.on_time_delivery_rate, 100)
+        self.assertEqual(self.vendor.quality_rating_avg, 4.5)
+        self.assertAlmostEqual(self.vendor.fulfillment_rate, 1 / 3 * 100)
+
+        self.po1.delete()
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_pos, 2)
+        self.assertEqual(self.vendor.completed_pos, 0)
+        self.assertEqual(self.vendor.on_time_delivery_rate, 0)
+        self.assertEqual(self.vendor.quality_rating_avg, 0)
+        self.assertEqual(self.vendor.fulfillment_rate, 0)
+
+    def test_update_performance_metrics_rebuilds_counters(self):
+        Vendor.objects.filter(pk=self.vendor.pk).update(total_pos=0, completed_pos=0)
+        update_performance_metrics(self.vendor)
+        self.assertEqual(self.vendor.total_pos, 2)
+        self.assertEqual(self.vendor.completed_pos, 2)
+        self.assertEqual(self.vendor.on_time_delivery_rate, 50)
+        self.assertEqual(self.vendor.fulfillment_rate, 100)
+
+    def test_recompute_vendor_metrics_command(self):
+        self.po1.issue_date = timezone.now() - timedelta(hours=2)
+        self.po1.acknowledgment_date = timezone.now()
+        self.po1.save()
+        Vendor.objects.update(
+            total_pos=0, on_time_delivery_rate=0, average_response_time=0
+        )
+        out = StringIO()
+        call_command("recompute_vendor_metrics", "--vendor", self.vendor.id, stdout=out)
+        self.assertIn("Recomputed 1 vendors", out.getvalue())
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_pos, 2)
+        self.assertEqual(self.vendor.on_time_delivery_rate, 50)
+        self.assertAlmostEqual(self.vendor.average_response_time, 7200, delta=5)
+
+    def test_performance_score_follows_metrics(self):
+        # 100 * (0.35 * 50 / 100 + 0.35 * 4.25 / 5 + 0.2 * 100 / 100): the
+        # response time scores 0 without acknowledged orders.
+        self.vendor.refresh_from_db()
+        self.assertAlmostEqual(self.vendor.performance_score, 67.25)
+        self.po2.status = "cancelled"
+        self.po2.save()
+        self.vendor.refresh_from_db()
+        self.assertAlmostEqual(self.vendor.performance_score, 76.5)
+
+        Vendor.objects.update(performance_score=0)
+        call_command("recompute_vendor_metrics", stdout=StringIO())
+        self.vendor.refresh_from_db()
+        self.assertAlmostEqual(self.vendor.performance_score, 76.5)
+        Vendor.objects.update(performance_score=0)
+        call_command("rescore_vendors", stdout=StringIO())
+        self.vendor.refresh_from_db()
+        self.assertAlmostEqual(self.vendor.performance_score, 76.5)
+
+        # Acknowledged in 12 hours: 0.1 * 86400 / (86400 + 43200) more.
+        self.po1.issue_date = timezone.now() - timedelta(hours=12)
+        self.po1.acknowledgment_date = timezone.now()
+        self.po1.save()
+        self.vendor.refresh_from_db()
+        self.assertAlmostEqual(self.vendor.performance_score, 76.5 + 20 / 3, places=2)
+
+        with override_settings(VENDOR_SCORE={"WEIGHTS": {"quality_rating_avg": 2}}):
+            out = StringIO()
+            call_command("rescore_vendors", stdout=out)
+        self.assertIn("Rescored 1 vendors", out.getvalue())
+        self.vendor.refresh_from_db()
+        self.assertAlmostEqual(self.vendor.performance_score, 90)
+        self.po1.quality_rating = 3.0
+        self.po1.save()
+        self.vendor.refresh_from_db()
+        self.assertAlmostEqual(self.vendor.performance_score, 66 + 20 / 3, places=2)
+
+    def test_leaderboard(self):
+        best = Vendor.objects.create(
+            name="Best Vendor",
+            contact_details="best@vendor.com",
+            address="1 Best St",
+            vendor_code="BEST001",
+        )
+        PurchaseOrder.objects.create(
+            po_number="PO20001",
+            vendor=best,
+            order_date=self.po1.order_date,
+            expected_delivery_date=self.po1.expected_delivery_date,
+            delivery_date=self.po1.delivery_date,
+            items={"item1": 1},
+            quantity=1,
+            status="completed",
+            quality_rating=5.0,
+        )
+        Vendor.objects.create(
+            name="New Vendor",
+            contact_details="new@vendor.com",
+            address="1 New St",
+            vendor_code="NEW001",
+        )
+        url = reverse("vendor-leaderboard")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(vendor["rank"], vendor["vendor_code"]) for vendor in response.data],
+            [(1, "BEST001"), (2, "PERF001")],
+        )
+        # Its response time scores 0: none of its orders was acknowledged.
+        self.assertEqual(response.data[0]["performance_score"], 90)
+        self.assertEqual(response.data[1]["total_pos"], 2)
+
+        response = self.client.get(url, {"k": 1, "min_pos": 2})
+        self.assertEqual(
+            [vendor["vendor_code"] for vendor in response.data], ["PERF001"]
+        )
+        response = self.client.get(url, {"min_pos": 0})
+        self.assertEqual(len(response.data), 3)
+        response = self.client.get(url, {"k": 0, "min_pos": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {"k", "min_pos"})
+
+        self.assertIn(
+            "USING INDEX api_vendor_score_idx",
+            Vendor.objects.filter(total_pos__gte=1)
+            .order_by("-performance_score", "id")[:20]
+            .explain(),
+        )
+
+    @override_settings(VENDOR_METRICS_DEFERRED=True)
+    def test_deferred_metrics_are_coalesced(self):
+        for quality_rating in (1.0, 2.0, 3.0):
+            self.po1.quality_rating = quality_rating
+            self.po1.save()
+        self.po2.delete()
+        self.assertEqual(DirtyVendor.objects.count(), 1)
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.quality_rating_avg, 4.25)
+
+        out = StringIO()
+        call_command("process_vendor_metrics", "--once", "--workers", "1", stdout=out)
+        self.assertIn("Recomputed 1 vendors", out.getvalue())
+        self.assertFalse(DirtyVendor.objects.exists())
+        self.vendor.refresh_from_db()
+        self.assertEqual(self.vendor.total_pos, 1)
+        self.assertEqual(self.vendor.quality_rating_avg, 3.0)
+        self.assertEqual(self.vendor.on_time_delivery_rate, 100)
+
+    def test_performance_etag_and_conditional_get(self):
+        url = reverse("vendor-performance", args=[self.vendor.id])
+        response = self.client.get(url, format="json")
+        etag = response["ETag"]
+        self.vendor.refresh_from_db()
+        self.assertEqual(etag, f'"{self.vendor.id}-{self.vendor.metrics_version}"')
+
+        # Served from the cache without touching the database.
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.po2.status = "cancelled"
+            self.po2.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["on_time_delivery_rate"], 100)
+
+    def test_performance_read_before_a_change_is_not_cached(self):
+        url = reverse("vendor-performance", args=[self.vendor.id])
+        store = set_cached_performance
+
+        def store_after_change(*args):
+            # The metrics change and are invalidated after the view read them.
+            with self.captureOnCommitCallbacks(execute=True):
+                Vendor.objects.filter(pk=self.vendor.pk).update(
+                    on_time_delivery_rate=75, metrics_version=F("metrics_version") + 1
+                )
+                invalidate_vendor_performance([self.vendor.pk])
+            store(*args)
+
+        with mock.patch(
+            "api.vendors.views.set_cached_performance", side_effect=store_after_change
+        ):
+            response = self.client.get(url)
+        self.assertEqual(response.data["on_time_delivery_rate"], 50)
+        response = self.client.get(url)
+        self.assertEqual(response.data["on_time_delivery_rate"], 75)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+    async def test_async_performance_view(self):
+        headers = {"authorization": "Token " + self.token.key}
+        url = reverse("vendor-performance", args=[self.vendor.id])
+        response = await self.async_client.get(url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["on_time_delivery_rate"], 50)
+        response = await self.async_client.get(
+            url, headers={**headers, "if-none-match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_performance_history_rollups(self):
+        # setUp's changes never committed, so they were not sampled.
+        self.assertEqual(record_vendor_history(), 1)
+        # Only the vendors whose metrics changed since their last sample.
+        self.assertEqual(record_vendor_history(), 0)
+        for po_status in ("cancelled", "completed"):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.po2.status = po_status
+                self.po2.save()
+        self.assertEqual(
+            HistoricalPerformance.objects.filter(vendor=self.vendor).count(), 3
+        )
+        out = StringIO()
+        call_command("record_vendor_history", stdout=out)
+        self.assertIn("Sampled 0 vendors", out.getvalue())
+
+        url = reverse("vendor-performance-history", args=[self.vendor.id])
+        self.client.get(url)  # Caches the token.
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {"bucket": "month"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        bucket = response.data[0]
+        self.assertEqual(bucket["samples"], 3)
+        self.assertEqual(bucket["on_time_delivery_rate"], 50)
+        self.assertAlmostEqual(bucket["on_time_delivery_rate_avg"], 200 / 3)
+
+        today = timezone.localdate().isoformat()
+        response = self.client.get(url, {"from": today, "to": f"{today}T23:59:59"})
+        self.assertEqual(response.data[0]["samples"], 3)
+        response = self.client.get(url, {"from": "2000-01-01", "to": "2000-01-02"})
+        self.assertEqual(response.data, [])
+
+    @override_settings(
+        VENDOR_PERFORMANCE_HISTORY={
+            "SAMPLE_RETENTION_DAYS": 30,
+            "DAILY_ROLLUP_RETENTION_DAYS": 60,
+        }
+    )
+    def test_performance_history_retention(self):
+        now = timezone.now()
+        for days in (0, 45, 90):
+            self.vendor.history_version = 0
+            self.vendor.save(update_fields=["history_version"])
+            record_vendor_history(recorded_at=now - timedelta(days=days))
+        self.assertEqual(prune_history(now), 3)
+        self.assertEqual(
+            HistoricalPerformance.objects.filter(vendor=self.vendor).count(), 1
+        )
+        self.assertEqual(
+            DailyPerformanceRollup.objects.filter(vendor=self.vendor).count(), 2
+        )
+        self.assertEqual(
+            MonthlyPerformanceRollup.objects.filter(vendor=self.vendor).count(), 3
+        )
+
+    def test_performance_history_validation(self):
+        url = reverse("vendor-performance-history", args=[self.vendor.id])
+        response = self.client.get(url, {"bucket": "year", "from": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        url = reverse("vendor-performance-history", args=[0])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
@@ -1,16 +1,34 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import VendorPerformanceView, VendorViewSet
+from .views import (
+    VendorImportView,
+    VendorLeaderboardView,
+    VendorPerformanceHistoryView,
+    VendorPerformanceView,
+    VendorViewSet,
+)
 
 router = DefaultRouter()
 router.register(r"", VendorViewSet)
 
+# Before the router, whose detail route would match them.
+collection_urlpatterns = [
+    path("leaderboard/", VendorLeaderboardView.as_view(), name="vendor-leaderboard"),
+    path("import/", VendorImportView.as_view(), name="vendor-import"),
+]
+
 urlpatterns = [
+    *collection_urlpatterns,
     path("", include(router.urls)),
     path(
         "<int:vendor_id>/performance/",
         VendorPerformanceView.as_view(),
         name="vendor-performance",
     ),
+    path(
+        "<int:vendor_id>/performance/history/",
+        VendorPerformanceHistoryView.as_view(),
+        name="vendor-performance-history",
+    ),
 ]
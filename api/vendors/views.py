@@ -1,29 +1,199 @@
+import io
+
 from django.http import Http404
-from rest_framework import permissions, viewsets
-from rest_framework.authentication import TokenAuthentication
+from django.utils.http import parse_etags
+from rest_framework import permissions, serializers, status, viewsets
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from api.async_views import AsyncReadView
+from api.mixins import FastListMixin, SparseFieldsMixin
+from api.pagination import IdCursorPagination
+from api.serializers import (
+    row_serializer,
+    sparse_fields,
+    sparse_queryset,
+    trim_fields,
+)
+from api.users.authentication import CachedTokenAuthentication
+from vms.db_routers import use_primary
+
+from .cache import (
+    aget_cached_performance,
+    aset_cached_performance,
+    get_cached_performance,
+    set_cached_performance,
+)
+from .history import ROLLUPS
+from .imports import ImportQuerySerializer, import_format, import_vendors
 from .models import Vendor
-from .serializers import VendorPerformanceSerializer, VendorSerializer
+from .serializers import (
+    LeaderboardQuerySerializer,
+    LeaderboardSerializer,
+    PerformanceRollupSerializer,
+    VendorPerformanceSerializer,
+    VendorSerializer,
+)
 
 
-class VendorViewSet(viewsets.ModelViewSet):
+class VendorViewSet(SparseFieldsMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Vendor.objects.all()
     serializer_class = VendorSerializer
-    authentication_classes = [TokenAuthentication]
+    pagination_class = IdCursorPagination
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+
+class VendorLeaderboardView(APIView):
+    """Top ``k`` vendors by performance score, read in score index order."""
+
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
+    def get(self, request):
+        query = LeaderboardQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        vendors = (
+            Vendor.objects.filter(total_pos__gte=query.validated_data["min_pos"])
+            .order_by("-performance_score", "id")
+            .only(*LeaderboardSerializer.Meta.fields)[: query.validated_data["k"]]
+        )
+        return Response(
+            [
+                {"rank": rank, **data}
+                for rank, data in enumerate(
+                    LeaderboardSerializer(vendors, many=True).data, 1
+                )
+            ]
+        )
+
+
+class VendorImportView(APIView):
+    """
+    Create or update (on ``vendor_code``) vendors from an uploaded CSV or JSONL
+    ``file``, read in chunks. Query parameters: ``input`` (csv or jsonl,
+    default from the file name) and ``start_line``.
+    """
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        params = ImportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        if upload is None:
+            raise serializers.ValidationError({"file": ["No file was submitted."]})
+        input_format = params.validated_data.get("input") or import_format(upload.name)
+        lines = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        report = import_vendors(
+            lines, input_format, start_line=params.validated_data["start_line"]
+        )
+        return Response(report.as_dict())
+
+
+def performance_response(request, vendor_id, cached):
+    version, data = cached
+    headers = {"ETag": f'"{vendor_id}-{version}"', "Cache-Control": "no-cache"}
+    if headers["ETag"] in parse_etags(request.headers.get("If-None-Match", "")):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(data, headers=headers)
+
+
+class AsyncVendorListView(AsyncReadView):
+    async def get(self, request):
+        paginator = IdCursorPagination()
+        field_names = sparse_fields(VendorSerializer, request.query_params)
+        rows = row_serializer(VendorSerializer).only(field_names)
+        queryset = rows.values(Vendor.objects.all(), (paginator.ordering,))
+        page = await paginator.apaginate_queryset(queryset, request, self)
+        return paginator.get_paginated_response(rows.many(page))
+
+
+class AsyncVendorDetailView(AsyncReadView):
+    async def get(self, request, pk):
+        field_names = sparse_fields(VendorSerializer, request.query_params)
+        queryset = sparse_queryset(Vendor.objects.all(), VendorSerializer, field_names)
+        try:
+            vendor = await queryset.aget(pk=pk)
+        except (Vendor.DoesNotExist, TypeError, ValueError):
+            raise Http404("No Vendor matches the given query.")
+        serializer = VendorSerializer(vendor, context={"request": request})
+        return Response(trim_fields(serializer, field_names).data)
+
 
 class VendorPerformanceView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, vendor_id):
-        try:
-            vendor = Vendor.objects.get(pk=vendor_id)
-        except Vendor.DoesNotExist:
-            raise Http404("Vendor not found")
+        # The payload is cached with the metrics version it was built from
+        # until the metrics change (see api.vendors.cache), so a cache hit
+        # needs no query.
+        cached, generation = get_cached_performance(vendor_id)
+        if cached is None:
+            # From the primary: a stale replica read would stay cached until
+            # the metrics change again.
+            try:
+                with use_primary():
+                    vendor = Vendor.objects.only(
+                        *VendorPerformanceSerializer.Meta.fields, "metrics_version"
+                    ).get(pk=vendor_id)
+            except Vendor.DoesNotExist:
+                raise Http404("Vendor not found")
+            cached = (vendor.metrics_version, VendorPerformanceSerializer(vendor).data)
+            set_cached_performance(vendor_id, generation, cached)
+        return performance_response(request, vendor_id, cached)
+
 
-        serializer = VendorPerformanceSerializer(vendor)
-        return Response(serializer.data)
+class AsyncVendorPerformanceView(AsyncReadView):
+    async def get(self, request, vendor_id):
+        cached, generation = await aget_cached_performance(vendor_id)
+        if cached is None:
+            try:
+                with use_primary():
+                    vendor = await Vendor.objects.only(
+                        *VendorPerformanceSerializer.Meta.fields, "metrics_version"
+                    ).aget(pk=vendor_id)
+            except Vendor.DoesNotExist:
+                raise Http404("Vendor not found")
+            cached = (vendor.metrics_version, VendorPerformanceSerializer(vendor).data)
+            await aset_cached_performance(vendor_id, generation, cached)
+        return performance_response(request, vendor_id, cached)
+
+
+class VendorPerformanceHistoryView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, vendor_id):
+        bucket = request.query_params.get("bucket", "day")
+        if bucket not in ROLLUPS:
+            raise serializers.ValidationError(
+                {"bucket": [f"Must be one of: {', '.join(ROLLUPS)}."]}
+            )
+        lookups = {}
+        errors = {}
+        for name, lookup in (
+            ("from", "bucket_start__gte"),
+            ("to", "bucket_start__lte"),
+        ):
+            value = request.query_params.get(name)
+            if value:
+                try:
+                    lookups[lookup] = serializers.DateTimeField().run_validation(value)
+                except serializers.ValidationError as exc:
+                    errors[name] = exc.detail
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        model, _ = ROLLUPS[bucket]
+        rollups = model.objects.filter(vendor_id=vendor_id, **lookups).order_by(
+            "bucket_start"
+        )
+        data = PerformanceRollupSerializer(rollups, many=True).data
+        if not data and not Vendor.objects.filter(pk=vendor_id).exists():
+            raise Http404("Vendor not found")
+        return Response(data)
@@ -0,0 +1,13 @@
+from django.http import Http404, HttpResponse
+
+from .instrumentation import instrumentation_settings, request_metrics
+
+
+def metrics(request):
+    """Request metrics of this process, for Prometheus. Local clients only."""
+    allowed_ips = instrumentation_settings()["METRICS_ALLOWED_IPS"]
+    if request.META.get("REMOTE_ADDR") not in allowed_ips:
+        raise Http404
+    return HttpResponse(
+        request_metrics.render(), content_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,19 @@
+"""
+URL configuration used for ASGI requests, see ``api.middleware``: the same
+routes as ``vms.urls``, with the read endpoints and the registration served by
+async views.
+"""
+
+from django.contrib import admin
+from django.urls import include, path
+
+from api.views import metrics
+
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path("metrics", metrics, name="metrics"),
+    path("api/vendors/", include("api.vendors.async_urls")),
+    path("api/purchase_orders/", include("api.purchase_orders.async_urls")),
+    path("api/users/", include("api.users.async_urls")),
+    path("api/", include("api.urls")),
+]
@@ -0,0 +1,46 @@
+"""
+SQLite backend taking two extra keys in its ``DATABASES`` entry:
+
+- ``TRANSACTION_MODE``: ``"IMMEDIATE"`` (or ``"EXCLUSIVE"``) makes transactions
+  take the write lock when they begin, so that two of them can't both read and
+  then deadlock upgrading to a write lock. ``None`` keeps SQLite's deferred
+  transactions.
+- ``PRAGMAS``: ``{name: value}`` set on every new connection, e.g.
+  ``{"journal_mode": "WAL", "synchronous": "NORMAL", "busy_timeout": 5000}``.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+from django.db.backends.sqlite3 import base
+from django.dispatch import receiver
+
+TRANSACTION_MODES = ("DEFERRED", "IMMEDIATE", "EXCLUSIVE")
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    @property
+    def transaction_mode(self):
+        mode = self.settings_dict.get("TRANSACTION_MODE")
+        if mode is not None and mode.upper() not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f"TRANSACTION_MODE must be one of {', '.join(TRANSACTION_MODES)} "
+                f"or None, not {mode!r}."
+            )
+        return mode
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.transaction_mode
+        self.cursor().execute(f"BEGIN {mode}" if mode else "BEGIN")
+
+
+@receiver(connection_created, sender=DatabaseWrapper)
+def apply_pragmas(sender, connection, **kwargs):
+    pragmas = connection.settings_dict.get("PRAGMAS") or {}
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            # Pragmas take no parameters; only let names and plain values in.
+            if not (
+                name.replace("_", "").isalnum() and str(value).lstrip("-").isalnum()
+            ):
+                raise ImproperlyConfigured(f"Invalid SQLite pragma: {name}={value!r}")
+            cursor.execute(f"PRAGMA {name} = {value}")
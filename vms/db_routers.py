@@ -0,0 +1,78 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class RoutingState:
+    """Whether the reads of the current request must go to the primary."""
+
+    def __init__(self, pinned=False):
+        # Set for good once the request writes.
+        self.pinned = pinned
+        self.use_primary = 0
+
+
+# Set for each request by api.middleware.DatabaseRoutingMiddleware. The state
+# is mutated rather than replaced, so that a write made in a thread (by the
+# async ORM or a sync view under ASGI) is seen by the rest of the request.
+routing_state = ContextVar("db_routing_state", default=None)
+
+
+@contextmanager
+def request_routing(pinned=False):
+    token = routing_state.set(RoutingState(pinned))
+    try:
+        yield
+    finally:
+        routing_state.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary within the block."""
+    state = routing_state.get()
+    if state is None:
+        yield
+        return
+    state.use_primary += 1
+    try:
+        yield
+    finally:
+        state.use_primary -= 1
+
+
+class PrimaryReplicaRouter:
+    """
+    Send the reads of requests to ``settings.REPLICA_DATABASE``, unless the
+    request has written (read-your-writes), they run in a transaction or in
+    a ``use_primary()`` block. Writes, and everything outside requests
+    (commands, workers), use the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replica = settings.REPLICA_DATABASE
+        state = routing_state.get()
+        if (
+            not replica
+            or state is None
+            or state.pinned
+            or state.use_primary
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        state = routing_state.get()
+        if state is not None:
+            state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary, schema included.
+        return db == DEFAULT_DB_ALIAS
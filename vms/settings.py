@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -41,6 +44,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.middleware.RequestInstrumentationMiddleware",
+    "api.middleware.DatabaseRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -48,10 +53,16 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.middleware.AsyncReadViewsMiddleware",
 ]
 
 ROOT_URLCONF = "vms.urls"
 
+# URLconf of ASGI requests, serving the read endpoints with async views. Set to
+# None to use ROOT_URLCONF under ASGI too.
+
+ASYNC_READ_URLCONF = "vms.asgi_urls"
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -73,13 +84,61 @@ WSGI_APPLICATION = "vms.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# VMS_DB_PROFILE=production tunes SQLite for concurrent writers: WAL journal,
+# synchronous=NORMAL, a busy timeout instead of "database is locked" errors,
+# memory-mapped I/O, a larger page cache, persistent connections and
+# transactions that take the write lock when they begin. Each VMS_SQLITE_*
+# variable (and VMS_DB_CONN_MAX_AGE) overrides one of these; empty disables it.
+
+DB_PROFILE = os.environ.get("VMS_DB_PROFILE", "development")
+if DB_PROFILE not in ("development", "production"):
+    raise ImproperlyConfigured(f"Unknown VMS_DB_PROFILE: {DB_PROFILE!r}")
+
+
+def db_setting(name, production, development=""):
+    return os.environ.get(
+        name, production if DB_PROFILE == "production" else development
+    )
+
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "ENGINE": "vms.db_backends.sqlite3",
+        "NAME": os.environ.get("VMS_DB_NAME", BASE_DIR / "db.sqlite3"),
+        "CONN_MAX_AGE": int(db_setting("VMS_DB_CONN_MAX_AGE", "600", "0") or 0),
+        "CONN_HEALTH_CHECKS": DB_PROFILE == "production",
+        "TRANSACTION_MODE": db_setting("VMS_SQLITE_TRANSACTION_MODE", "IMMEDIATE")
+        or None,
+        "PRAGMAS": {
+            name: value
+            for name, value in {
+                "journal_mode": db_setting("VMS_SQLITE_JOURNAL_MODE", "WAL"),
+                "synchronous": db_setting("VMS_SQLITE_SYNCHRONOUS", "NORMAL"),
+                "busy_timeout": db_setting("VMS_SQLITE_BUSY_TIMEOUT", "5000"),
+                "mmap_size": db_setting("VMS_SQLITE_MMAP_SIZE", "268435456"),
+                # Negative: in KiB rather than pages.
+                "cache_size": db_setting("VMS_SQLITE_CACHE_SIZE", "-64000"),
+            }.items()
+            if value
+        },
     }
 }
 
+# VMS_DB_REPLICA_NAME adds a read replica that the reads of requests are routed
+# to (vms.db_routers). Locally, a copy of the SQLite database kept in sync with
+# `python manage.py sync_replica --interval 1` can stand in for it.
+
+REPLICA_DATABASE = None
+if os.environ.get("VMS_DB_REPLICA_NAME"):
+    REPLICA_DATABASE = "replica"
+    DATABASES[REPLICA_DATABASE] = {
+        **DATABASES["default"],
+        "NAME": os.environ["VMS_DB_REPLICA_NAME"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["vms.db_routers.PrimaryReplicaRouter"]
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -123,6 +182,82 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
-    ]
+        "api.users.authentication.CachedTokenAuthentication",
+    ],
+    # orjson based, falling back to the stdlib JSON renderer and parser when
+    # orjson is not installed.
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.IdCursorPagination",
+    "PAGE_SIZE": 100,
+}
+
+# Token authentication cache (api.users.authentication.CachedTokenAuthentication).
+# Falls back to a bounded in-process LRU cache when ALIAS is not in CACHES.
+# Revoked tokens are only dropped from the cache of the other workers if it is
+# shared between them (Redis, Memcached...); `check --deploy` warns otherwise.
+
+TOKEN_AUTH_CACHE = {
+    "ALIAS": "default",
+    "TIMEOUT": 300,
+    "MAX_ENTRIES": 1024,
+}
+
+# Threads hashing the passwords of the async (ASGI) registration view
+# (api.users.hashing).
+
+PASSWORD_HASHING = {
+    "MAX_WORKERS": 2,
+}
+
+# Cache of the /api/vendors/<id>/performance/ payloads, invalidated whenever
+# the vendor metrics change.
+
+VENDOR_PERFORMANCE_CACHE = {
+    "ALIAS": "default",
+    "TIMEOUT": 3600,
+}
+
+# Retention of the vendor performance history recorded by
+# `python manage.py record_vendor_history` (None keeps it forever).
+
+VENDOR_PERFORMANCE_HISTORY = {
+    "SAMPLE_RETENTION_DAYS": 90,
+    "DAILY_ROLLUP_RETENTION_DAYS": 730,
+}
+
+# Weights of the vendor performance score behind /api/vendors/leaderboard/, see
+# api.vendors.scoring. Run `python manage.py rescore_vendors` after a change.
+
+VENDOR_SCORE = {
+    "WEIGHTS": {
+        "on_time_delivery_rate": 0.35,
+        "quality_rating_avg": 0.35,
+        "average_response_time": 0.1,
+        "fulfillment_rate": 0.2,
+    },
+    "RESPONSE_TIME_SCALE": 86400,
+}
+
+# When true, purchase order changes only queue their vendor in DirtyVendor and
+# the metrics are recomputed by `python manage.py process_vendor_metrics`.
+
+VENDOR_METRICS_DEFERRED = os.environ.get("VMS_VENDOR_METRICS_DEFERRED", "").lower() in (
+    "1",
+    "true",
+)
+
+# Per-request SQL and timing instrumentation (api.middleware), see
+# api.instrumentation.DEFAULT_REQUEST_INSTRUMENTATION for the other keys.
+
+REQUEST_INSTRUMENTATION = {
+    "SLOW_REQUEST_MS": 500,
+    "METRICS_ALLOWED_IPS": ["127.0.0.1", "::1"],
 }